@@ -0,0 +1,334 @@
+"""
+CPU paddle controllers.
+
+Paddle.auto_move is the original CPU: every tick it steps towards wherever
+the ball is right now. A controller passed as Match(cpu_controller=...)
+takes over the CPU paddle instead; the match calls
+controller.move(paddle, match) once per frame.
+
+InterceptController works out where the ball will cross the CPU paddle's
+face and goes there. Wall bounces are folded in closed form, so a plan
+costs O(1) however far away the ball is. The plan is only redone when the
+ball's velocity changes (paddle hit, wall bounce, gimmick) or the ball
+jumps (serve, reset), and the CPU only notices such a change after its
+reaction delay.
+
+The Easy, Medium and Hard CPUs are still the original chaser;
+InterceptController plays the "pro" difficulty. LookaheadController, the
+"expert" CPU, plans by playing candidate moves
+forward on a clone of the match under a strict per-frame time budget.
+"""
+import random
+import time
+
+from pong_engine import DIFFICULTY_SPEEDS, FPS, HEIGHT, NO_INPUT
+from pong_snapshot import from_snapshot, restore, snapshot
+
+# Reaction delay (ticks) and aiming error (px) for each DIFFICULTY_SPEEDS level
+INTERCEPT_LEVELS = {
+    "easy": {"reaction_ticks": 20, "error": 60},
+    "medium": {"reaction_ticks": 10, "error": 30},
+    "hard": {"reaction_ticks": 4, "error": 10},
+}
+
+
+def fold(y, low, high):
+    """Where a point that travels to y bounces to between two walls at low and high."""
+    span = high - low
+    if span <= 0:
+        return low
+    offset = (y - low) % (2 * span)
+    return low + (offset if offset <= span else 2 * span - offset)
+
+
+def predict_intercept(ball, cpu_paddle, player_paddle):
+    """
+    Center y of the ball when it next reaches the CPU paddle's face. A ball
+    heading away is assumed to come straight back off the player's paddle.
+    """
+    size = ball.rect.height
+    vx, vy = ball.speed_x, ball.speed_y
+    face = cpu_paddle.rect.right
+    if vx < 0:
+        distance = ball.x - face
+    elif vx > 0:
+        far_face = player_paddle.rect.left - size
+        distance = (far_face - ball.x) + (far_face - face)
+    else:
+        distance = -1
+    if distance < 0:
+        return ball.rect.centery
+    y = ball.y + vy * (distance / abs(vx))
+    return fold(y, 0, HEIGHT - size) + size / 2
+
+
+def move_towards(paddle, target, speed):
+    """Step paddle's center towards target by at most speed, stopping on it instead of jittering."""
+    step = max(-speed, min(speed, target - paddle.rect.centery))
+    paddle.rect.y = max(0, min(HEIGHT - paddle.rect.height, paddle.rect.y + step))
+
+
+class InterceptController:
+    # Moves don't depend on how long anything takes
+    timed = False
+
+    def __init__(self, reaction_ticks=10, error=30):
+        self.reaction_ticks = reaction_ticks
+        self.error = error
+        self.target = None
+        self.velocity = None
+        self.last_x = None
+        self.last_tick = None
+        self.changed_at = None
+        self.stale = True
+
+    @classmethod
+    def for_difficulty(cls, difficulty):
+        return cls(**INTERCEPT_LEVELS[difficulty])
+
+    def spec(self):
+        """Settings to rebuild this controller with make_controller (e.g. for replays)."""
+        return {"kind": "intercept", "reaction_ticks": self.reaction_ticks, "error": self.error}
+
+    def aim_error(self, match):
+        # Drawn from the seed and tick rather than a stream of its own, so
+        # the controller has no RNG state to record, replay or snapshot
+        if not self.error:
+            return 0
+        return random.Random(match.seed * 1_000_003 + match.tick).uniform(-self.error, self.error)
+
+    def move(self, paddle, match):
+        ball = match.ball
+        velocity = (ball.speed_x, ball.speed_y)
+        tick = match.tick
+        if self.last_tick is not None:
+            allowed = abs(ball.speed_x) * (tick - self.last_tick) + 1
+        if self.last_tick is None or velocity != self.velocity or abs(ball.x - self.last_x) > allowed:
+            self.velocity = velocity
+            self.changed_at = tick
+            self.stale = True
+        self.last_x = ball.x
+        self.last_tick = tick
+
+        if self.stale and tick - self.changed_at >= self.reaction_ticks:
+            self.target = predict_intercept(ball, paddle, match.player_paddle) + self.aim_error(match)
+            self.stale = False
+
+        speed = match.cpu_speed + (2 if match.dodgeball_mode else 0)
+        move_towards(paddle, HEIGHT / 2 if self.target is None else self.target, speed)
+
+
+class PlanFollower:
+    """Plays a fixed list of per-tick moves (-1 up, 0 stay, 1 down) on a simulated match."""
+
+    def __init__(self):
+        self.plan = ()
+        self.index = 0
+
+    def start(self, plan, index=0):
+        self.plan = plan
+        self.index = index
+
+    def move(self, paddle, match):
+        if self.index < len(self.plan):
+            step_paddle(paddle, self.plan[self.index], match)
+        self.index += 1
+
+
+def step_paddle(paddle, direction, match):
+    speed = match.cpu_speed + (2 if match.dodgeball_mode else 0)
+    paddle.rect.y = max(0, min(HEIGHT - paddle.rect.height, paddle.rect.y + direction * speed))
+
+
+class LookaheadController:
+    """
+    The "expert" CPU. It searches over plans, each a run of up/stay/down
+    moves over the next horizon ticks. Every candidate is scored by playing
+    it out on a clone of the match, restored from a pong_snapshot snapshot,
+    with the real rules (gimmicks, hot potato explosions, dodgeball hits)
+    and a player that chases the ball. The best plans are kept as a beam,
+    shifted one tick along each frame and refined, so the search carries
+    over from frame to frame instead of restarting.
+
+    Each frame gets budget_us microseconds of search, checked after every
+    simulated step; a rollout still running when time is up is dropped. With
+    no time for any, the CPU follows the best plan it already has, and
+    before it has one it falls back to an InterceptController. Pass rollouts instead for
+    a fixed number per frame, which makes the controller deterministic
+    (replays, tournaments) at the cost of the time guarantee.
+    """
+
+    def __init__(self, budget_us=2000, rollouts=None, horizon=96, segment=8, beam_width=4, seed=None):
+        self.budget_us = budget_us
+        self.rollouts = rollouts
+        self.horizon = horizon
+        self.segment = segment
+        self.beam_width = beam_width
+        self.seed = seed
+        self.rng = None
+        self.beam = []
+        self.scratch = None
+        self.follower = PlanFollower()
+        self.fallback = InterceptController(**INTERCEPT_LEVELS["hard"])
+        self.last_tick = None
+        self.moves = 0
+
+    @property
+    def timed(self):
+        """Whether the moves depend on how fast the search runs, so settings alone can't replay them."""
+        return self.budget_us is not None and self.rollouts is None
+
+    def spec(self):
+        return {"kind": "lookahead", "budget_us": self.budget_us, "rollouts": self.rollouts,
+                "horizon": self.horizon, "segment": self.segment, "beam_width": self.beam_width, "seed": self.seed}
+
+    def candidates(self):
+        """Plans worth scoring this frame: the beam first, then steady moves, then variations of the best."""
+        best = self.beam[0][1] if self.beam else (0,) * self.horizon
+        yield best
+        for _, plan in self.beam[1:]:
+            yield plan
+        for direction in (-1, 0, 1):
+            yield (direction,) * self.horizon
+        segments = self.horizon // self.segment
+        while True:
+            plan = list(best)
+            start = self.rng.randrange(segments) * self.segment
+            end = start + self.segment * self.rng.randint(1, 3)
+            plan[start:end] = [self.rng.choice((-1, 0, 1))] * (min(end, self.horizon) - start)
+            yield tuple(plan)
+
+    def rollout(self, root, plan, deadline=None):
+        """How good plan looks from root, or None if deadline (perf_counter_ns) passes first."""
+        scratch = self.scratch
+        restore(scratch, root)
+        scratch.player_auto = True
+        # The root is taken mid-tick, just before the CPU paddle's move for
+        # this tick, so the plan's first move happens before stepping
+        step_paddle(scratch.cpu_paddle, plan[0], scratch)
+        self.follower.start(plan, 1)
+        cpu_score, player_score = scratch.cpu_score, scratch.player_score
+        frames = self.segment if scratch.swept_collisions else 1
+        for elapsed in range(0, self.horizon, frames):
+            scratch.step(NO_INPUT, frames)
+            if deadline is not None and time.perf_counter_ns() > deadline:
+                return None
+            if scratch.cpu_score != cpu_score or scratch.player_score != player_score:
+                # Points sooner count for more than points later
+                urgency = 1 + (self.horizon - elapsed) / self.horizon
+                return 1000 * urgency * ((scratch.cpu_score - cpu_score) - (scratch.player_score - player_score))
+        paddle, ball = scratch.cpu_paddle, scratch.ball
+        if not paddle.active:
+            return -500
+        if ball.speed_x < 0:
+            return -abs(paddle.rect.centery - predict_intercept(ball, paddle, scratch.player_paddle))
+        return -0.1 * abs(paddle.rect.centery - HEIGHT / 2)
+
+    def search(self, match):
+        start = time.perf_counter_ns()
+        deadline = None if self.budget_us is None else start + self.budget_us * 1000
+        root = snapshot(match)
+        if self.scratch is None:
+            self.scratch = from_snapshot(root)
+            self.scratch.cpu_controller = self.follower
+        scored = {}
+        for plan in self.candidates():
+            if len(scored) == self.rollouts:
+                break
+            if plan in scored:
+                continue
+            score = self.rollout(root, plan, deadline)
+            if score is None:
+                break
+            scored[plan] = score
+        # Plans there was no time to rescore keep last frame's score
+        merged = {plan: score for score, plan in self.beam}
+        merged.update(scored)
+        self.beam = sorted(((score, plan) for plan, score in merged.items()), key=lambda item: -item[0])[:self.beam_width]
+
+    def move(self, paddle, match):
+        if self.rng is None:
+            self.rng = random.Random(match.seed if self.seed is None else self.seed)
+        if match.tick != self.last_tick:
+            if self.beam and self.last_tick is not None:
+                shift = min(match.tick - self.last_tick, self.horizon)
+                self.beam = [(score, plan[shift:] + plan[-1:] * shift) for score, plan in self.beam]
+            self.last_tick = match.tick
+            self.moves = 0
+            self.search(match)
+        # A multi-frame step calls move once per frame on the same tick
+        if self.beam:
+            step_paddle(paddle, self.beam[0][1][min(self.moves, self.horizon - 1)], match)
+        else:
+            self.fallback.move(paddle, match)
+        self.moves += 1
+
+
+CONTROLLERS = {"intercept": InterceptController, "lookahead": LookaheadController}
+
+
+def make_controller(spec):
+    """Build a controller from its spec(), or None for the original auto_move CPU."""
+    if spec is None:
+        return None
+    spec = dict(spec)
+    return CONTROLLERS[spec.pop("kind")](**spec)
+
+
+def for_difficulty(difficulty):
+    """
+    CPU speed and controller for a menu difficulty. The DIFFICULTY_SPEEDS
+    levels keep the original chaser (no controller); "pro" and "expert"
+    play at hard speed with an InterceptController and a LookaheadController.
+    """
+    if difficulty == "expert":
+        return DIFFICULTY_SPEEDS["hard"], LookaheadController()
+    if difficulty == "pro":
+        return DIFFICULTY_SPEEDS["hard"], InterceptController.for_difficulty("hard")
+    return DIFFICULTY_SPEEDS[difficulty], None
+
+
+assert set(INTERCEPT_LEVELS) == set(DIFFICULTY_SPEEDS)
+
+
+if __name__ == "__main__":
+    from pong_engine import Match
+    from pong_tournament import ScriptedPlayer
+
+    def play(cpu_speed, controller, seed, ticks=FPS * 60):
+        match = Match(cpu_speed=cpu_speed, seed=seed, cpu_controller=controller)
+        player = ScriptedPlayer()
+        reversals, last_step, last_y = 0, 0, match.cpu_paddle.rect.y
+        for _ in range(ticks):
+            match.step(player.inputs(match))
+            step = match.cpu_paddle.rect.y - last_y
+            if step and last_step and (step > 0) != (last_step > 0):
+                reversals += 1
+            if step:
+                last_step = step
+            last_y = match.cpu_paddle.rect.y
+        return match, reversals
+
+    for difficulty in (*DIFFICULTY_SPEEDS, "expert"):
+        for name in ("chase", "pong_ai"):
+            if difficulty == "expert" and name == "chase":
+                continue
+            # The expert searches for 2 ms every frame, so it gets fewer matches
+            matches = 4 if difficulty == "expert" else 20
+            start = time.perf_counter()
+            totals = [0, 0, 0]
+            for seed in range(matches):
+                if difficulty == "expert":
+                    cpu_speed, controller = for_difficulty(difficulty)
+                elif name == "chase":
+                    cpu_speed, controller = DIFFICULTY_SPEEDS[difficulty], None
+                else:
+                    cpu_speed, controller = DIFFICULTY_SPEEDS[difficulty], InterceptController.for_difficulty(difficulty)
+                match, reversals = play(cpu_speed, controller, seed)
+                totals[0] += match.cpu_score
+                totals[1] += match.player_score
+                totals[2] += reversals
+            elapsed = time.perf_counter() - start
+            print(f"{difficulty:>6} {name:>7}: CPU {totals[0] / matches:5.2f} - {totals[1] / matches:5.2f} "
+                  f"scripted player per minute, {totals[2] / matches:6.1f} direction changes/min, "
+                  f"{elapsed / (matches * 60 * FPS) * 1e6:7.1f} us/tick")
@@ -0,0 +1,512 @@
+"""
+Vectorized batch simulator: N CPU-vs-CPU matches advanced together.
+
+All per-match state lives in NumPy arrays of length N (dodgeballs are N x 5)
+and every tick is a fixed sequence of masked array operations that mirrors
+pong_engine.Match.step with the player paddle on auto_move. Integer rect
+coordinates use pygame's rounding (half away from zero) so a batch match
+follows exactly the same trajectory as the engine given the same random
+draws. Used for tuning DIFFICULTY_SPEEDS and WINNING_SCORE over very large
+numbers of matches. Ball.sweep is mirrored operation for operation in
+float64, so swept matches stay in lockstep with the engine too.
+
+Both paddles are the original ball chaser (Paddle.auto_move), the CPU
+the game plays at easy, medium and hard. The pro and expert CPUs (pong_ai
+controllers) are only modelled by pong_tournament's --cpu options.
+"""
+import numpy as np
+
+from pong_engine import (
+    WIDTH, HEIGHT, BALL_SPEED, PADDLE_SPEED, FPS, WINNING_SCORE, MAX_BOUNCES, DIFFICULTY_SPEEDS, ms_to_ticks,
+)
+
+BALL_SIZE = 30
+PADDLE_W, PADDLE_H = 10, 140
+PLAYER_X, CPU_X = WIDTH - 20, 10
+CHAOS_SIZE = 40
+DODGEBALL_SIZE = 15
+DODGEBALL_COUNT = 5
+MAX_SPEED = 10
+
+# Gimmick codes
+NONE, HOT_POTATO, DODGEBALL, SPEED_UP, SPEED_DOWN = range(5)
+GIMMICKS = ["hot_potato", "dodgeball", "speed_change_increase", "speed_change_decrease"]
+# last_touched_by codes
+NOBODY, PLAYER, CPU = range(3)
+# What a frozen match does when its freeze ends (Match.freeze callbacks);
+# PLAYING means not frozen
+PLAYING, SERVE, END_EXPLOSION, CLEANUP_HOT_POTATO, END_DODGEBALL = range(5)
+
+REQUIRED_WINS = {"single_play": None, "bo3": 2, "bo5": 3}
+
+
+def pg_round(values):
+    """Round like pygame.Rect does when assigned a float (half away from zero)."""
+    return np.where(values >= 0, np.floor(values + 0.5), np.ceil(values - 0.5)).astype(np.int64)
+
+
+def overlaps(ax, ay, aw, ah, bx, by, bw, bh):
+    """Vectorized pygame.Rect.colliderect."""
+    return (ax < bx + bw) & (ax + aw > bx) & (ay < by + bh) & (ay + ah > by)
+
+
+def sweep_aabb(x, y, w, h, vx, vy, left, top, right, bottom, limit):
+    """
+    Vectorized pong_collision.sweep_aabb. Returns (hit, t, nx, ny) arrays;
+    t, nx and ny are only meaningful where hit is set.
+    """
+    overlap = (x < right) & (x + w > left) & (y < bottom) & (y + h > top)
+    dx = (left + right) / 2 - (x + w / 2)
+    inside = overlap & (dx * vx > 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_entry = np.where(vx > 0, (left - (x + w)) / vx, np.where(
+            vx < 0, (right - x) / vx, np.where((x + w <= left) | (x >= right), np.inf, -np.inf)))
+        x_exit = np.where(vx > 0, (right - x) / vx, np.where(vx < 0, (left - (x + w)) / vx, np.inf))
+        y_entry = np.where(vy > 0, (top - (y + h)) / vy, np.where(
+            vy < 0, (bottom - y) / vy, np.where((y + h <= top) | (y >= bottom), np.inf, -np.inf)))
+        y_exit = np.where(vy > 0, (bottom - y) / vy, np.where(vy < 0, (top - (y + h)) / vy, np.inf))
+
+    entry = np.maximum(x_entry, y_entry)
+    swept = ~overlap & (entry < np.minimum(x_exit, y_exit)) & (entry >= 0) & (entry < limit)
+    x_face = x_entry >= y_entry
+    nx = np.where(inside, np.where(dx > 0, -1, 1), np.where(x_face, np.where(vx > 0, -1, 1), 0))
+    ny = np.where(inside | x_face, 0, np.where(vy > 0, -1, 1))
+    return inside | swept, np.where(inside, 0.0, entry), nx, ny
+
+
+class BatchSimulator:
+    """
+    Run n matches at once. cpu_speed and player_speed may be scalars or
+    length-n arrays, so one batch can sweep several difficulty settings.
+    """
+
+    def __init__(self, n, classic_mode=False, game_mode="single_play", cpu_speed=DIFFICULTY_SPEEDS["medium"],
+                 player_speed=PADDLE_SPEED, winning_score=WINNING_SCORE, seed=None, swept_collisions=True):
+        self.n = n
+        self.classic_mode = classic_mode
+        self.swept_collisions = swept_collisions
+        self.game_mode = game_mode
+        self.required_wins = REQUIRED_WINS[game_mode]
+        self.winning_score = winning_score
+        self.rng = np.random.default_rng(seed)
+        self.tick = 0
+
+        self.ball_x = np.full(n, WIDTH // 2 - BALL_SIZE // 2, dtype=np.int64)
+        self.ball_y = np.full(n, HEIGHT // 2 - BALL_SIZE // 2, dtype=np.int64)
+        # Sub-pixel ball position for swept matches; ball_x/ball_y are it rounded
+        self.ball_fx = self.ball_x.astype(float)
+        self.ball_fy = self.ball_y.astype(float)
+        self.ball_vx = np.empty(n)
+        self.ball_vy = np.empty(n)
+        self.hot_potato_hits = np.zeros(n, dtype=np.int64)
+        self.last_touched_by = np.zeros(n, dtype=np.int8)
+        self._launch(np.ones(n, dtype=bool))
+
+        self.player_y = np.full(n, HEIGHT // 2 - PADDLE_H // 2, dtype=np.int64)
+        self.cpu_y = np.full(n, HEIGHT // 2 - PADDLE_H // 2, dtype=np.int64)
+        self.player_speed = np.broadcast_to(np.asarray(player_speed, dtype=float), n).copy()
+        self.cpu_speed = np.broadcast_to(np.asarray(cpu_speed, dtype=float), n).copy()
+
+        self.player_score = np.zeros(n, dtype=np.int64)
+        self.cpu_score = np.zeros(n, dtype=np.int64)
+        self.player_games_won = np.zeros(n, dtype=np.int64)
+        self.cpu_games_won = np.zeros(n, dtype=np.int64)
+        self.scoring_paused = np.zeros(n, dtype=bool)
+        self.scoring_resume_tick = np.zeros(n, dtype=np.int64)
+        self.finished = np.zeros(n, dtype=bool)
+        self.finish_tick = np.zeros(n, dtype=np.int64)
+
+        self.gimmick = np.zeros(n, dtype=np.int8)
+        self.chaos_active = np.zeros(n, dtype=bool)
+        self.chaos_x = np.zeros(n, dtype=np.int64)
+        self.chaos_y = np.zeros(n, dtype=np.int64)
+        self.chaos_gimmick = np.zeros(n, dtype=np.int8)
+
+        self.dodgeball_mode = np.zeros(n, dtype=bool)
+        self.dodge_x = np.zeros((n, DODGEBALL_COUNT), dtype=np.int64)
+        self.dodge_y = np.zeros((n, DODGEBALL_COUNT), dtype=np.int64)
+        self.dodge_vx = np.zeros((n, DODGEBALL_COUNT), dtype=np.int64)
+        self.dodge_vy = np.zeros((n, DODGEBALL_COUNT), dtype=np.int64)
+
+        # original_speeds from the engine: both keys are always set and
+        # cleared together, so one flag covers them
+        self.has_original = np.ones(n, dtype=bool)
+        self.original_vx = self.ball_vx.copy()
+        self.original_vy = self.ball_vy.copy()
+        self.original_paddle = self.player_speed.copy()
+        self.speed_change_timer = np.full(n, -1, dtype=np.int64)
+
+        self.pending_action = np.zeros(n, dtype=np.int8)
+        self.freeze_end = np.zeros(n, dtype=np.int64)
+        self.freeze_armed = np.zeros(n, dtype=np.int64)
+
+        self.explosions = np.zeros(n, dtype=np.int64)
+
+    def _launch(self, mask):
+        """Ball.reset's random serve directions for the masked matches."""
+        count = int(mask.sum())
+        self.ball_vx[mask] = BALL_SPEED * self.rng.choice((1, -1), count)
+        self.ball_vy[mask] = BALL_SPEED * self.rng.choice((1, -1), count)
+
+    def _reset_ball(self, mask):
+        self.ball_x[mask] = WIDTH // 2 - BALL_SIZE // 2
+        self.ball_y[mask] = HEIGHT // 2 - BALL_SIZE // 2
+        self.ball_fx[mask] = self.ball_x[mask]
+        self.ball_fy[mask] = self.ball_y[mask]
+        self._launch(mask)
+        self.hot_potato_hits[mask] = 0
+        self.last_touched_by[mask] = NOBODY
+
+    def _reset_round(self, mask):
+        self._reset_ball(mask)
+        self.player_y[mask] = HEIGHT // 2 - PADDLE_H // 2
+        self.cpu_y[mask] = HEIGHT // 2 - PADDLE_H // 2
+
+    def _freeze(self, mask, duration, action):
+        self.pending_action[mask] = action
+        self.freeze_end[mask] = self.tick + ms_to_ticks(duration)
+        self.freeze_armed[mask] = self.tick
+
+    def _end_freezes(self):
+        ending = (self.pending_action != PLAYING) & (self.tick >= self.freeze_end)
+        if not ending.any():
+            return
+        action = np.where(ending, self.pending_action, PLAYING)
+        self.pending_action[ending] = PLAYING
+
+        serve = action == SERVE
+        self._reset_ball(serve)
+        self.gimmick[serve] = NONE
+        self.chaos_active[serve] = False
+
+        explosion = action == END_EXPLOSION
+        self._reset_round(explosion)
+        self.gimmick[explosion] = NONE
+
+        cleanup = action == CLEANUP_HOT_POTATO
+        self.hot_potato_hits[cleanup] = 0
+        self.gimmick[cleanup] = NONE
+        self._reset_round(cleanup)
+
+        # reset_to_normal_mode, which serves after a further freeze
+        dodge = action == END_DODGEBALL
+        self.dodgeball_mode[dodge] = False
+        self.gimmick[dodge] = NONE
+        self._freeze(dodge, 500, SERVE)
+
+    def _expire_speed_changes(self, mask):
+        expired = mask & (self.speed_change_timer >= 0) & (self.tick - self.speed_change_timer > ms_to_ticks(5000))
+        if expired.any():
+            self._revert_speed_changes(expired)
+            self.speed_change_timer[expired] = -1
+
+    def _revert_speed_changes(self, mask):
+        mask = mask & self.has_original
+        self.ball_vx[mask] = self.original_vx[mask]
+        self.ball_vy[mask] = self.original_vy[mask]
+        self.player_speed[mask] = self.original_paddle[mask]
+        self.cpu_speed[mask] = DIFFICULTY_SPEEDS["medium"]
+        self.has_original[mask] = False
+
+    def _ball_wall_collision(self, mask):
+        top = mask & (self.ball_y < 0)
+        bottom = mask & ~top & (self.ball_y + BALL_SIZE > HEIGHT)
+        self.ball_y[top] = 0
+        self.ball_vy[top] = np.abs(self.ball_vy[top])
+        self.ball_y[bottom] = HEIGHT - BALL_SIZE
+        self.ball_vy[bottom] = -np.abs(self.ball_vy[bottom])
+        self.ball_fy[top | bottom] = self.ball_y[top | bottom]
+
+    def _ball_paddle_collision(self, paddle_x, paddle_y, toucher, mask):
+        hit = mask & overlaps(self.ball_x, self.ball_y, BALL_SIZE, BALL_SIZE, paddle_x, paddle_y, PADDLE_W, PADDLE_H)
+        self.ball_vx[hit] *= -1
+        self.last_touched_by[hit] = toucher
+        self.hot_potato_hits += hit & (self.gimmick == HOT_POTATO) & ~self.dodgeball_mode
+
+    def _sweep_ball(self, mask):
+        """
+        Ball.sweep for one frame, for the masked matches. Each bounce pass
+        only carries on with the matches that hit something in the last one.
+        """
+        rows = np.flatnonzero(mask)
+        fx, fy = self.ball_fx, self.ball_fy
+        vx_all, vy_all = self.ball_vx, self.ball_vy
+        remaining = np.ones(len(rows))
+        for _ in range(MAX_BOUNCES):
+            if not len(rows):
+                break
+            x, y, vx, vy = fx[rows], fy[rows], vx_all[rows], vy_all[rows]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t_top = np.maximum(0.0, (0 - y) / vy)
+                t_bottom = np.maximum(0.0, (HEIGHT - BALL_SIZE - y) / vy)
+            top = (vy < 0) & (t_top < remaining)
+            bottom = (vy > 0) & (t_bottom < remaining)
+            t_hit = np.where(top, t_top, np.where(bottom, t_bottom, remaining))
+            paddle_hit = np.zeros(len(rows), dtype=bool)
+            nx = np.zeros(len(rows))
+            ny = np.zeros(len(rows))
+            toucher = np.zeros(len(rows), dtype=np.int8)
+            for paddle_x, paddle_y, who in ((PLAYER_X, self.player_y, PLAYER), (CPU_X, self.cpu_y, CPU)):
+                paddle_y = paddle_y[rows]
+                hit, t, hit_nx, hit_ny = sweep_aabb(x, y, BALL_SIZE, BALL_SIZE, vx, vy, paddle_x, paddle_y,
+                                                    paddle_x + PADDLE_W, paddle_y + PADDLE_H, t_hit)
+                t_hit = np.where(hit, t, t_hit)
+                paddle_hit |= hit
+                nx = np.where(hit, hit_nx, nx)
+                ny = np.where(hit, hit_ny, ny)
+                toucher = np.where(hit, who, toucher)
+
+            fx[rows] = x + vx * t_hit
+            fy[rows] = y + vy * t_hit
+            top &= ~paddle_hit
+            bottom &= ~paddle_hit
+            vy = np.where(top, np.abs(vy), np.where(bottom, -np.abs(vy), vy))
+            vx = np.where(paddle_hit & (nx != 0), np.abs(vx) * nx, vx)
+            vy = np.where(paddle_hit & (nx == 0), np.abs(vy) * ny, vy)
+            vx_all[rows], vy_all[rows] = vx, vy
+            touched = rows[paddle_hit]
+            self.last_touched_by[touched] = toucher[paddle_hit]
+            self.hot_potato_hits[touched] += (self.gimmick[touched] == HOT_POTATO) & ~self.dodgeball_mode[touched]
+
+            bounced = top | bottom | paddle_hit
+            remaining = (remaining - t_hit)[bounced]
+            rows = rows[bounced]
+
+        self.ball_x = np.where(mask, pg_round(fx), self.ball_x)
+        self.ball_y = np.where(mask, pg_round(fy), self.ball_y)
+        self.ball_vx = np.where(mask, np.clip(vx_all, -MAX_SPEED, MAX_SPEED), vx_all)
+        self.ball_vy = np.where(mask, np.clip(vy_all, -MAX_SPEED, MAX_SPEED), vy_all)
+
+    def _auto_move(self, paddle_y, speed, mask):
+        speed = speed + np.where(self.dodgeball_mode, 2, 0)
+        paddle_center = paddle_y + PADDLE_H // 2
+        ball_center = self.ball_y + BALL_SIZE // 2
+        down = mask & (paddle_center < ball_center) & (paddle_y + PADDLE_H < HEIGHT)
+        up = mask & (paddle_center > ball_center) & (paddle_y > 0)
+        moved = paddle_y + np.where(down, speed, np.where(up, -speed, 0))
+        return np.where(down | up, pg_round(moved), paddle_y)
+
+    def _spawn_dodgeballs(self, mask):
+        """Rejection-sample five non-overlapping dodgeballs, as activate_dodgeball does."""
+        for i in np.flatnonzero(mask):
+            placed = 0
+            while placed < DODGEBALL_COUNT:
+                x = self.rng.integers(50, WIDTH - 50 + 1)
+                y = self.rng.integers(50, HEIGHT - 50 + 1)
+                if not overlaps(self.dodge_x[i, :placed], self.dodge_y[i, :placed], DODGEBALL_SIZE, DODGEBALL_SIZE,
+                                x, y, DODGEBALL_SIZE, DODGEBALL_SIZE).any():
+                    self.dodge_x[i, placed] = x
+                    self.dodge_y[i, placed] = y
+                    placed += 1
+        count = int(mask.sum())
+        self.dodge_vx[mask] = self.rng.choice((-BALL_SPEED, BALL_SPEED), (count, DODGEBALL_COUNT))
+        self.dodge_vy[mask] = self.rng.choice((-BALL_SPEED, BALL_SPEED), (count, DODGEBALL_COUNT))
+
+    def _activate(self, mask):
+        kind = self.chaos_gimmick
+        hot = mask & (kind == HOT_POTATO)
+        self.gimmick[hot] = HOT_POTATO
+        self.ball_vx[hot] = np.clip(self.ball_vx[hot] * 1.3, -MAX_SPEED, MAX_SPEED)
+        self.ball_vy[hot] = np.clip(self.ball_vy[hot] * 1.3, -MAX_SPEED, MAX_SPEED)
+
+        dodge = mask & (kind == DODGEBALL)
+        if dodge.any():
+            self.gimmick[dodge] = DODGEBALL
+            self.dodgeball_mode[dodge] = True
+            self._spawn_dodgeballs(dodge)
+
+        speed = mask & ((kind == SPEED_UP) | (kind == SPEED_DOWN))
+        if speed.any():
+            factor = np.where(kind == SPEED_UP, 3, 0.3)[speed]
+            self.gimmick[speed] = kind[speed]
+            capture = speed & ~self.has_original
+            self.original_vx[capture] = self.ball_vx[capture]
+            self.original_vy[capture] = self.ball_vy[capture]
+            self.original_paddle[capture] = self.player_speed[capture]
+            self.has_original[speed] = True
+            self.ball_vx[speed] *= factor
+            self.ball_vy[speed] *= factor
+            self.cpu_speed[speed] *= factor
+            self.player_speed[speed] *= factor
+            self.speed_change_timer[speed] = self.tick
+
+    def _handle_chaos(self, playing):
+        spawn = playing & ~self.chaos_active & (self.gimmick == NONE) & (self.rng.random(self.n) < 0.01)
+        if spawn.any():
+            count = int(spawn.sum())
+            self.chaos_x[spawn] = self.rng.integers(100, WIDTH - 140 + 1, count)
+            self.chaos_y[spawn] = self.rng.integers(50, HEIGHT - 90 + 1, count)
+            self.chaos_gimmick[spawn] = self.rng.integers(HOT_POTATO, SPEED_DOWN + 1, count)
+            self.chaos_active |= spawn
+
+        hit = playing & self.chaos_active & overlaps(self.ball_x, self.ball_y, BALL_SIZE, BALL_SIZE,
+                                           self.chaos_x, self.chaos_y, CHAOS_SIZE, CHAOS_SIZE)
+        if hit.any():
+            self._revert_speed_changes(hit & ((self.gimmick == SPEED_UP) | (self.gimmick == SPEED_DOWN)))
+            self._activate(hit)
+            self.chaos_active[hit] = False
+
+        # handle_hot_potato
+        normal = playing & ~self.dodgeball_mode
+        self._ball_wall_collision(normal)
+        explode = normal & (self.gimmick == HOT_POTATO) & (self.hot_potato_hits >= 6)
+        if explode.any():
+            self.explosions += explode
+            self._award(explode & (self.last_touched_by == CPU), explode & (self.last_touched_by == PLAYER))
+            self._freeze(explode, 1000, END_EXPLOSION)
+
+    def _award(self, player, cpu):
+        live = ~self.finished
+        self.player_score += player & live
+        self.cpu_score += cpu & live
+
+    def _handle_dodgeballs(self, mask):
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            return
+        x = self.dodge_x[rows] + self.dodge_vx[rows]
+        y = self.dodge_y[rows] + self.dodge_vy[rows]
+        vx = self.dodge_vx[rows]
+        vy = self.dodge_vy[rows]
+        vy = np.where((y <= 0) | (y + DODGEBALL_SIZE >= HEIGHT), -vy, vy)
+        vx = np.where((x <= 0) | (x + DODGEBALL_SIZE >= WIDTH), -vx, vx)
+        self.dodge_x[rows], self.dodge_y[rows] = x, y
+        self.dodge_vx[rows], self.dodge_vy[rows] = vx, vy
+
+        hits_player = overlaps(x, y, DODGEBALL_SIZE, DODGEBALL_SIZE,
+                               PLAYER_X, self.player_y[rows, None], PADDLE_W, PADDLE_H)
+        hits_cpu = overlaps(x, y, DODGEBALL_SIZE, DODGEBALL_SIZE,
+                            CPU_X, self.cpu_y[rows, None], PADDLE_W, PADDLE_H)
+        any_hit = hits_player | hits_cpu
+        hit_rows = any_hit.any(axis=1)
+        if not hit_rows.any():
+            return
+        # Only the first dodgeball (in list order) to touch a paddle counts
+        first = any_hit.argmax(axis=1)
+        player_hit = hits_player[np.arange(len(rows)), first] & hit_rows
+        cpu_hit = ~player_hit & hit_rows
+        scored = np.zeros(self.n, dtype=bool)
+        to_cpu = np.zeros(self.n, dtype=bool)
+        to_player = np.zeros(self.n, dtype=bool)
+        scored[rows[hit_rows]] = True
+        to_cpu[rows[player_hit]] = True
+        to_player[rows[cpu_hit]] = True
+        self._award(to_player, to_cpu)
+        self._freeze(scored, 500, END_DODGEBALL)
+
+    def _update_scoring(self, playing):
+        hot = playing & (self.gimmick == HOT_POTATO)
+        dodge = playing & (self.gimmick == DODGEBALL)
+        right = self.ball_x + BALL_SIZE >= WIDTH
+        left = ~right & (self.ball_x <= 0)
+
+        # update_hot_potato
+        goal = hot & (right | left)
+        if goal.any():
+            self._award(hot & left, hot & right)
+            self._freeze(goal, 1000, CLEANUP_HOT_POTATO)
+
+        self._handle_dodgeballs(dodge)
+
+        # update_normal_scoring
+        normal = playing & ~hot & ~dodge & ~self.scoring_paused
+        goal = normal & (right | left)
+        if goal.any():
+            self._award(normal & left, normal & right)
+            self.scoring_paused[goal] = True
+            self._revert_speed_changes(goal)
+            self._freeze(goal, 500, SERVE)
+            self.scoring_resume_tick[goal] = self.freeze_end[goal] + ms_to_ticks(1000)
+
+    def _check_winning_conditions(self):
+        live = ~self.finished
+        if self.required_wins is None:
+            done = live & ((self.player_score >= self.winning_score) | (self.cpu_score >= self.winning_score))
+        else:
+            player_game = live & (self.player_score >= self.winning_score)
+            cpu_game = live & ~player_game & (self.cpu_score >= self.winning_score)
+            self.player_games_won += player_game
+            self.cpu_games_won += cpu_game
+            game_over = player_game | cpu_game
+            if game_over.any():
+                self.player_score[game_over] = 0
+                self.cpu_score[game_over] = 0
+                self._reset_ball(game_over)
+            done = live & ((self.player_games_won == self.required_wins) | (self.cpu_games_won == self.required_wins))
+        self.finished |= done
+        self.finish_tick[done] = self.tick
+
+    def step(self):
+        """Advance every match by one tick."""
+        self.tick += 1
+        resume = self.scoring_paused & (self.tick >= self.scoring_resume_tick)
+        self.scoring_paused &= ~resume
+
+        # Timers due on the same tick fire in the order they were armed, as
+        # in pong_timers.Scheduler
+        speed_first = self.speed_change_timer <= self.freeze_armed
+        self._expire_speed_changes(speed_first)
+        self._end_freezes()
+        self._expire_speed_changes(~speed_first)
+        playing = self.pending_action == PLAYING
+        if self.swept_collisions:
+            self._sweep_ball(playing)
+        else:
+            self.ball_x = np.where(playing, pg_round(self.ball_x + self.ball_vx), self.ball_x)
+            self.ball_y = np.where(playing, pg_round(self.ball_y + self.ball_vy), self.ball_y)
+            self.ball_fx = self.ball_x.astype(float)
+            self.ball_fy = self.ball_y.astype(float)
+            self.ball_vx = np.where(playing, np.clip(self.ball_vx, -MAX_SPEED, MAX_SPEED), self.ball_vx)
+            self.ball_vy = np.where(playing, np.clip(self.ball_vy, -MAX_SPEED, MAX_SPEED), self.ball_vy)
+            self._ball_wall_collision(playing)
+            self._ball_paddle_collision(PLAYER_X, self.player_y, PLAYER, playing)
+            self._ball_paddle_collision(CPU_X, self.cpu_y, CPU, playing)
+        self.player_y = self._auto_move(self.player_y, self.player_speed, playing)
+        self.cpu_y = self._auto_move(self.cpu_y, self.cpu_speed, playing)
+
+        if not self.classic_mode:
+            self._handle_chaos(playing)
+            playing &= self.pending_action == PLAYING
+
+        self._update_scoring(playing)
+        self._check_winning_conditions()
+
+    def run(self, max_ticks=1_000_000):
+        """Step until every match has finished or max_ticks have passed."""
+        while not self.finished.all() and self.tick < max_ticks:
+            self.step()
+        return self.results()
+
+    def results(self):
+        """Per-match outcome arrays: winner (PLAYER/CPU/NOBODY), finish tick and scores."""
+        if self.required_wins is None:
+            player_ahead = self.player_score > self.cpu_score
+        else:
+            player_ahead = self.player_games_won > self.cpu_games_won
+        winner = np.where(self.finished, np.where(player_ahead, PLAYER, CPU), NOBODY).astype(np.int8)
+        return {
+            "winner": winner,
+            "finish_tick": self.finish_tick.copy(),
+            "player_score": self.player_score.copy(),
+            "cpu_score": self.cpu_score.copy(),
+            "player_games_won": self.player_games_won.copy(),
+            "cpu_games_won": self.cpu_games_won.copy(),
+            "explosions": self.explosions.copy(),
+        }
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    for name, speed in DIFFICULTY_SPEEDS.items():
+        sim = BatchSimulator(n, cpu_speed=speed, seed=0)
+        start = time.perf_counter()
+        results = sim.run(max_ticks=FPS * 60 * 10)
+        elapsed = time.perf_counter() - start
+        cpu_rate = (results["winner"] == CPU).mean()
+        unfinished = (results["winner"] == NOBODY).mean()
+        print(f"{name:>6}: CPU win rate {cpu_rate:.3f} ({unfinished:.3f} unfinished) over {n} matches, "
+              f"{sim.tick} ticks, {n * sim.tick / elapsed:,.0f} match-ticks/s")
@@ -1,739 +1,462 @@
-import pygame
-import random
-import sys
-import time
-
-# Initialize pygame
-pygame.init()
-
-# Screen dimensions and constants
-WIDTH, HEIGHT = 800, 600
-BALL_SPEED = 5
-PADDLE_SPEED = 6
-FPS = 60
-WINNING_SCORE = 5  # Winning score per game
-
-# Colors
-WHITE = (255, 255, 255)
-BLACK = (0, 0, 0)
-RED = (255, 0, 0)
-BLUE = (0, 0, 255)
-
-# Fonts
-FONT = pygame.font.Font(None, 36)
-TITLE_FONT = pygame.font.Font(None, 72)
-
-DIFFICULTY_SPEEDS = {
-    "easy": 3,
-    "medium": 5,
-    "hard": 7
-}
-
-class Ball:
-    def __init__(self):
-        self.rect = pygame.Rect(WIDTH // 2 - 15, HEIGHT // 2 - 15, 30, 30)
-        self.speed_x = BALL_SPEED * random.choice((1, -1))
-        self.speed_y = BALL_SPEED * random.choice((1, -1))
-        self.hot_potato_hits = 0
-        self.last_touched_by = None
-
-    def move(self):
-        self.rect.x += self.speed_x
-        self.rect.y += self.speed_y
-
-        max_speed = 10
-        self.speed_x = max(-max_speed, min(max_speed, self.speed_x))
-        self.speed_y = max(-max_speed, min(max_speed, self.speed_y))
-
-    def reset(self):
-        self.rect.center = (WIDTH // 2, HEIGHT // 2)
-        self.speed_x = BALL_SPEED * random.choice((1, -1))
-        self.speed_y = BALL_SPEED * random.choice((1, -1))
-        self.hot_potato_hits = 0
-        self.last_touched_by = None
-    
-    def wall_collision(self):
-
-        if self.rect.top < 0:
-            print(f"Collision at TOP - Ball Position: {self.rect.topleft}, Speed: {self.speed_y}")
-            self.rect.top = 0
-            self.speed_y = abs(self.speed_y)
-        elif self.rect.bottom > HEIGHT:
-            print(f"Collision at BOTTOM - Ball Position: {self.rect.bottomright}, Speed: {self.speed_y}")
-            self.rect.bottom = HEIGHT
-            self.speed_y = -abs(self.speed_y)
-
-    def paddle_collision(self, paddle, game):
-        if self.rect.colliderect(paddle.rect):
-            self.speed_x *= -1
-            self.last_touched_by = "player" if paddle.rect.x > WIDTH // 2 else "cpu"
-
-            # Increment hit counter only if hot potato is active
-            if game.gimmick_active == "hot_potato" and not game.dodgeball_mode:
-                self.hot_potato_hits += 1
-
-
-
-class Paddle:
-    def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y, 10, 140)
-        self.active = True
-    
-    def reset(self):
-        self.rect.y = HEIGHT // 2 - self.rect.height // 2
-        self.active = True
-
-    def move(self, up_key, down_key, game):
-        current_speed = PADDLE_SPEED + (2 if game.dodgeball_mode else 0)
-        keys = pygame.key.get_pressed()
-        if keys[up_key] and self.rect.top > 0:
-            self.rect.y -= current_speed
-        if keys[down_key] and self.rect.bottom < HEIGHT:
-            self.rect.y += current_speed
-
-    def auto_move(self, ball, game):
-        current_speed = game.cpu_speed + (2 if game.dodgeball_mode else 0)
-        if self.rect.centery < ball.rect.centery and self.rect.bottom < HEIGHT:
-            self.rect.y += current_speed
-        elif self.rect.centery > ball.rect.centery and self.rect.top > 0:
-            self.rect.y -= current_speed
-    
-    def draw(self, screen):
-        if self.active:
-            pygame.draw.rect(screen, WHITE, self.rect)
-
-
-class ChaosObject:
-    def __init__(self):
-        self.rect = pygame.Rect(random.randint(100, WIDTH - 140), random.randint(50, HEIGHT - 90), 40, 40)
-        self.gimmick = ChaosObject.randomize_gimmick() # Call as an instance method
-
-    def randomize_gimmick():
-        return random.choice(["hot_potato", "dodgeball", "speed_change_increase", "speed_change_decrease"])
-
-    def draw(self, screen):
-        pygame.draw.rect(screen, BLUE, self.rect)
-
-class Explosion:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.radius = 10
-        self.max_radius = 80
-        self.growth_rate = 8
-        self.active = True
-    
-    def update(self):
-
-        if self.radius < self.max_radius:
-            self.radius += self.growth_rate
-        else:
-            self.active = False
-    
-    def draw(self, screen):
-
-        if self.active:
-
-            pygame.draw.circle(screen, RED, (self.x, self.y), self.radius, 2)
-
-            pygame.draw.circle(screen, WHITE, (self.x, self.y), self.radius // 2)
-
-class Dodgeball:
-    def __init__(self, x, y, speed_x, speed_y):
-        self.rect = pygame.Rect(x, y, 15, 15)
-        self.speed_x = speed_x
-        self.speed_y = speed_y
-    
-    def move(self):
-        self.rect.x += self.speed_x
-        self.rect.y += self.speed_y
-    
-    def wall_collision(self):
-        if self.rect.top <= 0 or self.rect.bottom >= HEIGHT:
-            self.speed_y *= -1
-        if self.rect.left <= 0 or self.rect.right >= WIDTH:
-            self.speed_x *= -1
-    
-    def draw(self, screen):
-        pygame.draw.ellipse(screen, RED, self.rect)
-
-class Game:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        pygame.display.set_caption("Pong: Chaos Edition")
-        self.clock = pygame.time.Clock()
-        self.ball = Ball()
-        self.player_paddle = Paddle(WIDTH - 20, HEIGHT // 2 - 70)
-        self.cpu_paddle = Paddle(10, HEIGHT // 2 - 70)
-        self.scoring_paused = False
-        self.player_score = 0
-        self.cpu_score = 0
-        self.running = True
-        self.cpu_speed = DIFFICULTY_SPEEDS["medium"]
-        self.chaos_object = None
-        self.gimmick_active = None
-        self.dodgeballs = []
-        self.dodgeball_mode = False
-        self.player_games_won = 0
-        self.cpu_games_won = 0
-        self.classic_mode = False
-        self.game_mode = "single_play"
-        self.paused = False
-        self.explosions = []
-        self.speed_change_timer = None
-        self.original_speeds = {
-            "ball": (self.ball.speed_x, self.ball.speed_y),
-            "paddle": PADDLE_SPEED
-        }
-
-    def reset_ball(self):
-        print("Resetting ball to center position.")
-        time.sleep(0.5)
-        self.ball.reset()
-        print(f"Ball reset to: {self.ball.rect.center}")
-        self.gimmick_active = None
-        self.chaos_object = None
-
-    def pause_game(self, duration):
-        pygame.time.wait(duration)
-    
-    def reset_round(self):
-        self.ball.reset()
-        self.player_paddle.reset()
-        self.cpu_paddle.reset()
-
-    def display_score(self):
-        player_text = FONT.render(f"{self.player_score}", True, WHITE)
-        cpu_text = FONT.render(f"{self.cpu_score}", True, WHITE)
-        self.screen.blit(player_text, (WIDTH - 50, 10))
-        self.screen.blit(cpu_text, (30, 10))
-
-    def display_game_progress(self):
-        """Display the game progress for BO3 or BO5."""
-        if self.game_mode in ["bo3", "bo5"]:
-            progress_text = FONT.render(f"Games Won - Player: {self.player_games_won} | CPU: {self.cpu_games_won}", True, WHITE)
-            self.screen.blit(progress_text, (WIDTH // 2 - progress_text.get_width() // 2, 30))
-
-    def spawn_chaos_object(self):
-        if not self.chaos_object and self.gimmick_active is None and random.random() < 0.01:
-            self.chaos_object = ChaosObject()
-
-
-
-    def handle_chaos_collision(self):
-        """
-        Handle collision with the chaos object.
-        Only activate hot potato without triggering an explosion.
-        """
-
-        if self.chaos_object and self.ball.rect.colliderect(self.chaos_object.rect):
-            if self.gimmick_active in ["speed_change_increase", "speed_change_decrease"]:
-                self.revert_speed_changes()
-
-            gimmick = self.chaos_object.gimmick 
-            if gimmick == "hot_potato":
-                self.activate_hot_potato()
-            elif gimmick == "dodgeball":
-                self.activate_dodgeball()
-            elif gimmick == "speed_change_increase":
-                self.activate_speed_change(increase = True)
-            elif gimmick == "speed_change_decrease":
-                self.activate_speed_change(increase = False)
-            self.chaos_object = None
-
-    def activate_hot_potato(self):
-        """
-        Activate the "hot potato" gimmick. Speeds up the ball.
-        """
-        self.gimmick_active = "hot_potato"
-        self.ball.speed_x *= 1.3
-        self.ball.speed_y *= 1.3
-
-        max_speed = 10
-        self.ball.speed_x = max(-max_speed, min(max_speed, self.ball.speed_x))
-        self.ball.speed_y = max(-max_speed, min(max_speed, self.ball.speed_y))
-
-    def handle_hot_potato(self):
-        """
-        Handle the "hot potato" gimmick behavior:
-        - Reset hit counter on goal.
-        - Explode the ball after too many hits.
-        - Ensure opponent scores on goal.
-        """
-
-        if self.dodgeball_mode:
-            return
-
-        self.ball.wall_collision()
-
-        if self.gimmick_active == "hot_potato":
-            # Check for explosion after too many hits
-            if self.ball.hot_potato_hits >= 6:
-                self.explosions.append(Explosion(self.ball.rect.centerx, self.ball.rect.centery))
-
-                if self.ball.last_touched_by == "player":
-                    self.player_paddle.active = False
-                    self.cpu_score += 1
-                elif self.ball.last_touched_by == "cpu":
-                    self.cpu_paddle.active = False
-                    self.player_score += 1
-
-                self.pause_game(1000)
-                self.reset_round()
-                self.gimmick_active = None
-    
-    def activate_dodgeball(self):
-        self.gimmick_active = "dodgeball"
-        self.dodgeball_mode = True
-        self.dodgeballs = []
-        while len(self.dodgeballs) < 5:
-            x = random.randint(50, WIDTH - 50)
-            y = random.randint(50, HEIGHT - 50)
-            speed_x = random.choice([-BALL_SPEED, BALL_SPEED])
-            speed_y = random.choice([-BALL_SPEED, BALL_SPEED])
-
-            new_dodgeball = Dodgeball(x, y, speed_x, speed_y)
-            if not any(dodgeball.rect.colliderect(new_dodgeball.rect) for dodgeball in self.dodgeballs):
-                self.dodgeballs.append(new_dodgeball)
-
-
-    def handle_dodgeball_mode(self):
-
-        for dodgeball in self.dodgeballs:
-            dodgeball.move()
-            dodgeball.wall_collision()
-            
-            if dodgeball.rect.colliderect(self.player_paddle.rect):
-                self.cpu_score += 1
-                self.pause_game(500)
-                self.reset_to_normal_mode()
-                return
-            elif dodgeball.rect.colliderect(self.cpu_paddle.rect):
-                self.player_score += 1
-                self.pause_game(500)
-                self.reset_to_normal_mode()
-                return
-    
-    def reset_to_normal_mode(self):
-        self.dodgeballs = []
-        self.dodgeball_mode = False
-        self.gimmick_active = None
-        self.reset_ball()
-    
-    def activate_speed_change(self, increase = True):
-        global PADDLE_SPEED
-        factor = 3 if increase else 0.3
-        self.gimmick_active = "speed_change_increase" if increase else "speed_change_decrease"
-        
-        if "ball" not in self.original_speeds or "paddle" not in self.original_speeds:
-            self.original_speeds["ball"] = (self.ball.speed_x, self.ball.speed_y)
-            self.original_speeds["paddle"] = PADDLE_SPEED
-        
-        self.ball.speed_x *= factor
-        self.ball.speed_y *= factor
-        self.cpu_speed *= factor
-        PADDLE_SPEED *= factor
-        self.speed_change_timer = pygame.time.get_ticks()
-
-    def handle_speed_change_timer(self):
-
-        if self.speed_change_timer and pygame.time.get_ticks() - self.speed_change_timer > 5000:
-            self.revert_speed_changes()
-            self.speed_change_timer = None
-
-    def revert_speed_changes(self):
-        global PADDLE_SPEED
-
-        if "ball" in self.original_speeds:
-            self.ball.speed_x, self.ball.speed_y = self.original_speeds["ball"]
-
-        if "paddle" in self.original_speeds:
-            PADDLE_SPEED = self.original_speeds["paddle"]
-            self.cpu_speed = DIFFICULTY_SPEEDS["medium"]
-
-        self.original_speeds.clear()       
-
-
-    def update_normal_scoring(self):
-
-        if self.scoring_paused:
-            return
-        
-        if self.ball.rect.right >= WIDTH:
-            self.cpu_score += 1
-            self.handle_scoring_event()
-        elif self.ball.rect.left <= 0:
-            self.player_score += 1
-            self.handle_scoring_event()
-    
-    def handle_scoring_event(self):
-
-        self.scoring_paused = True
-        self.revert_speed_changes()
-        self.reset_ball()
-        
-        pygame.time.set_timer(pygame.USEREVENT, 1000)
-    
-    def update_hot_potato(self):
-        if self.gimmick_active == "hot_potato":
-            if self.ball.rect.right >= WIDTH:
-                self.cpu_score += 1
-                print("Hot Potato: Ball hit the player's goal. CPU scores!")  # Debugging statement
-                pygame.time.wait(1000)
-                self.cleanup_hot_potato()
-        
-            elif self.ball.rect.left <= 0:
-                self.player_score += 1
-                print("Hot Potato: Ball hit the CPU's goal. Player scores!")  # Debugging statement
-                pygame.time.wait(1000)
-                self.cleanup_hot_potato()
-    
-    def cleanup_hot_potato(self):
-        self.ball.hot_potato_hits = 0
-        self.gimmick_active = None
-        self.reset_round()
-
-
-    def draw(self):
-        self.screen.fill(BLACK)
-        pygame.draw.rect(self.screen, WHITE, self.player_paddle.rect)
-        pygame.draw.rect(self.screen, WHITE, self.cpu_paddle.rect)
-        if not self.dodgeball_mode:
-            pygame.draw.ellipse(
-                self.screen,
-                RED if self.gimmick_active == "hot_potato" else WHITE,
-                self.ball.rect
-            )
-        pygame.draw.aaline(self.screen, WHITE, (WIDTH // 2, 0), (WIDTH // 2, HEIGHT))
-        self.display_score()
-        self.display_game_progress()
-
-        
-
-        
-
-        if self.dodgeball_mode:
-            for dodgeball in self.dodgeballs:
-                dodgeball.draw(self.screen)
-
-        if self.chaos_object:
-            self.chaos_object.draw(self.screen)
-        
-        for explosion in self.explosions:
-            explosion.update()
-            explosion.draw(self.screen)
-        self.explosions = [e for e in self.explosions if e.active]
-
-    def title_screen(self):
-        while True:
-            self.screen.fill(BLACK)
-            title_text = TITLE_FONT.render("Pong: Chaos Edition", True, WHITE)
-            subtitle_text = FONT.render("Press any key to start", True, WHITE)
-            self.screen.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, HEIGHT // 2 - 100))
-            self.screen.blit(subtitle_text, (WIDTH // 2 - subtitle_text.get_width() // 2, HEIGHT // 2 + 50))
-            pygame.display.flip()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    return
-    
-    def choose_classic_mode(self):
-
-        while True:
-            self.screen.fill(BLACK)
-            title_text = TITLE_FONT.render("Select Mode", True, WHITE)
-            classic_text = FONT.render("1. Classic Mode", True, WHITE)
-            chaos_text = FONT.render("2. Chaos Mode", True, WHITE )
-
-            self.screen.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, HEIGHT // 2 - 100))
-            self.screen.blit(classic_text, (WIDTH // 2 - classic_text.get_width() // 2, HEIGHT // 2))
-            self.screen.blit(chaos_text, (WIDTH // 2 - chaos_text.get_width() // 2, HEIGHT // 2 + 50))
-            pygame.display.flip()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_1:
-                        self.classic_mode = True
-                        return
-                    
-                    elif event.key == pygame.K_2:
-                        self.classic_mode = False
-                        return
-                    
-    def choose_game_mode(self):
-        while True:
-            self.screen.fill(BLACK)
-            title_text = TITLE_FONT.render("Choose Game Mode", True, WHITE)
-            single_text = FONT.render("1. Single Play", True, WHITE)
-            bo3_text = FONT.render("2. Best of 3", True, WHITE)
-            bo5_text = FONT.render("3. Best of 5", True, WHITE)
-
-            self.screen.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, HEIGHT // 2 - 100))
-            self.screen.blit(single_text, (WIDTH // 2 - single_text.get_width() // 2, HEIGHT // 2))
-            self.screen.blit(bo3_text, (WIDTH // 2 - bo3_text.get_width() // 2, HEIGHT // 2 + 50))
-            self.screen.blit(bo5_text, (WIDTH // 2 - bo5_text.get_width() // 2, HEIGHT // 2 + 100))
-            pygame.display.flip()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_1:
-                        self.game_mode = "single_play"
-                        return
-                    elif event.key == pygame.K_2:
-                        self.game_mode = "bo3"
-                        return
-                    elif event.key == pygame.K_3:
-                        self.game_mode = "bo5"
-                        return
-
-    def choose_difficulty(self):
-        while True:
-            self.screen.fill(BLACK)
-            title_text = TITLE_FONT.render("Select Difficulty", True, WHITE)
-            easy_text = FONT.render("1. Easy", True, WHITE)
-            medium_text = FONT.render("2. Medium", True, WHITE)
-            hard_text = FONT.render("3. Hard", True, WHITE)
-
-            self.screen.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, HEIGHT // 2 - 100))
-            self.screen.blit(easy_text, (WIDTH // 2 - easy_text.get_width() // 2, HEIGHT // 2))
-            self.screen.blit(medium_text, (WIDTH // 2 - medium_text.get_width() // 2, HEIGHT // 2 + 50))
-            self.screen.blit(hard_text, (WIDTH // 2 - hard_text.get_width() // 2, HEIGHT // 2 + 100))
-            pygame.display.flip()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_1:
-                        self.cpu_speed = DIFFICULTY_SPEEDS["easy"]
-                        return
-                    elif event.key == pygame.K_2:
-                        self.cpu_speed = DIFFICULTY_SPEEDS["medium"]
-                        return
-                    elif event.key == pygame.K_3:
-                        self.cpu_speed = DIFFICULTY_SPEEDS["hard"]
-                        return
-    def pause_menu(self):
-        while True:
-            self.screen.fill(BLACK)
-            title_text = TITLE_FONT.render("Game Paused", True, WHITE)
-            continue_text = FONT.render("1. Continue", True, WHITE)
-            restart_text = FONT.render("2. Restart", True, WHITE)
-            menu_text = FONT.render("3. Return to the Main Menu", True, WHITE)
-            quit_text = FONT.render("4. Quit the Game", True, WHITE)
-
-            self.screen.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, HEIGHT // 2 - 150))
-            self.screen.blit(continue_text, (WIDTH // 2 - continue_text.get_width() // 2, HEIGHT // 2 - 50))
-            self.screen.blit(restart_text, (WIDTH // 2 - restart_text.get_width() // 2, HEIGHT // 2))
-            self.screen.blit(menu_text, (WIDTH // 2 - menu_text.get_width() // 2, HEIGHT // 2 + 50))
-            self.screen.blit(quit_text, (WIDTH // 2 - quit_text.get_width() // 2, HEIGHT // 2 + 100))
-            pygame.display.flip()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_1:
-                        return
-                    elif event.key == pygame.K_2:
-                        if self.confirm_action("Restart"):
-                            self.reset_game_state()
-                            return
-                    elif event.key == pygame.K_3:
-                        if self.confirm_action("Return to the Main Menu"):
-                            self.__init__()
-                            self.run()
-                    elif event.key == pygame.K_4:
-                        if self.confirm_action("Quit the Game"):
-                            pygame.quit()
-                            sys.exit()
-    
-    def confirm_action(self, action_text):
-
-        while True:
-            self.screen.fill(BLACK)
-            title_text = FONT.render(f"Are you sure you want to {action_text}?", True, WHITE)
-            yes_text = FONT.render("1. Yes", True, WHITE)
-            no_text = FONT.render("2. No", True, WHITE)
-
-            self.screen.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, HEIGHT // 2 - 50))
-            self.screen.blit(yes_text, (WIDTH // 2 - yes_text.get_width() // 2, HEIGHT // 2))
-            self.screen.blit(no_text, (WIDTH // 2 - no_text.get_width() // 2, HEIGHT // 2 + 50))
-            pygame.display.flip()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_1:
-                        return True
-                    
-                    elif event.key == pygame.K_2:
-                        return False
-    
-    def reset_game_state(self):
-        self.player_score = 0
-        self.cpu_score = 0
-        self.player_games_won = 0
-        self.cpu_games_won = 0
-        self.ball.reset()
-        self.player_paddle.reset()
-        self.gimmick_active = None
-        self.chaos_object = None
-        self.explosions = []
-        self.speed_change_timer = None
-
-        self.revert_speed_changes()
-
-    def check_winning_conditions(self):
-        if self.game_mode == "single_play":
-            return self.player_score >= WINNING_SCORE or self.cpu_score >= WINNING_SCORE
-        elif self.game_mode in ["bo3", "bo5"]:
-            if self.player_score >= WINNING_SCORE:
-                self.player_games_won += 1
-                self.reset_scores()
-            elif self.cpu_score >= WINNING_SCORE:
-                self.cpu_games_won += 1
-                self.reset_scores()
-
-            required_wins = 2 if self.game_mode == "bo3" else 3
-            return self.player_games_won == required_wins or self.cpu_games_won == required_wins
-
-    def reset_scores(self):
-        self.player_score = 0
-        self.cpu_score = 0
-        self.ball.reset()
-
-    def game_over_screen(self):
-        winner = "Player" if self.player_games_won > self.cpu_games_won else "CPU"
-        while True:
-            self.screen.fill(BLACK)
-            title_text = TITLE_FONT.render(f"{winner} Wins!", True, WHITE)
-            subtitle_text = FONT.render("Press R to Restart or Q to Quit", True, WHITE)
-            self.screen.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, HEIGHT // 2 - 100))
-            self.screen.blit(subtitle_text, (WIDTH // 2 - subtitle_text.get_width() // 2, HEIGHT // 2 + 50))
-            pygame.display.flip()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_r:
-                        self.__init__()
-                        self.run()
-                    elif event.key == pygame.K_q:
-                        pygame.quit()
-                        sys.exit()
-
-    def run(self):
-        self.title_screen()
-        self.choose_classic_mode()
-        self.choose_game_mode()
-        self.choose_difficulty()
-
-        while self.running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                elif event.type == pygame.USEREVENT:
-                    self.scoring_paused = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_p:  # Pause the game
-                        self.pause_menu()
-
-            self.ball.move()
-            self.ball.wall_collision()
-            self.ball.paddle_collision(self.player_paddle, self)
-            self.ball.paddle_collision(self.cpu_paddle, self)
-            self.player_paddle.move(pygame.K_UP, pygame.K_DOWN, self)
-            self.cpu_paddle.auto_move(self.ball, self)
-            
-            if not self.classic_mode:
-                self.spawn_chaos_object()
-                self.handle_chaos_collision()
-                self.handle_hot_potato()
-            
-            if self.gimmick_active == "hot_potato":
-                self.update_hot_potato()
-            elif self.gimmick_active == "dodgeball":
-                self.handle_dodgeball_mode()
-            else:
-                self.update_normal_scoring()
-            
-            self.handle_speed_change_timer()
-
-
-            if self.check_winning_conditions():
-                self.game_over_screen()
-
-            self.draw()
-            pygame.display.flip()
-            self.clock.tick(FPS)
-
-
-if __name__ == "__main__":
-    Game().run()
-
-    
-
-    
-
-
-
-
-
-
-
-#Update Notes:
-#Fixed issue with crashing when the Hot Potato Ball gets into contact with the paddle
-#Fixed Collision issues
-#Hit Counter is now exclusive to hot potato and ball won't explode when in contact with the Chaos Object
-#Fixed Scoring bug to where the point is awarded to the wrong player
-#Added the option to choose from classic mode and chaos mode
-#Added the Pause Menu function
-#Dodgeball mechanic implemented
-#Speed Increase and Speed Decrese Gimmicks implemented affecting both paddles and the balls
-#Minor bug fixes with hot potato causing a softlock
-#Added a brief pause when the Hot Potato hits the goal
-
-
-
-#TODOS:
-
-#Bugs present in the code:
-#Hot Potato Explodes too early on contact with the Paddle
-#Ball sticking on the paddle on occasion
-
-
-#Gimmicks to implement:
-#1. Reverse Controls
-#2. Invisible Ball for a set amount of time or if it hits the goal
-#3. Lucky Score goes to the last paddle the ball makes contact with (low chance)
-#4. Penalty Score to the last paddle the ball makes contact with (higher chance)
-
-#Tips for implementing the gimmicks:
-#Make sure the gimmicks are connected to the Chaos Object, there will be a logic error if they aren't connected to the Chaos Object.
-#If running into issues, use AI to diagnose the problem and troubleshoot. Also analyze the code to ensure nothing is out of the oridinary
-#If running into further trouble, reach out on Discord so we can troubleshoot the problem together.
-
-
-#Misc:
-#Add a text that tells the player which gimmick is activiated for a couple of seconds
-#Add more notes for clarity
-#Review the code to make sure everything looks nice and presentable once all of the gimmicks are implemented
-#Tweak the Game Over Menu to ask the player "Are You Sure" much like the Pause Menu
-#Once the code is complete, remove any debugging code to make the project ready to be submitted
+import argparse
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+
+from pong_engine import WIDTH, HEIGHT, FPS, Explosion, Match, Inputs
+import pong_ai
+from pong_events import LEVELS, EventLog
+from pong_menu import Menu, SceneStack
+from pong_profiler import Profiler
+from pong_render import BLACK, BLUE, RED, WHITE, DirtyRenderer, SpriteAtlas, TextCache
+from pong_replay import PAUSED, RESTART, Recording, apply
+
+# Fonts, loaded by init_ui()
+FONT = None
+TITLE_FONT = None
+SMALL_FONT = None
+
+# The match always advances in ticks of this length, whatever the render rate
+TICK_SECONDS = 1 / FPS
+# Most ticks simulated per rendered frame; past this the game slows down
+# instead of falling further behind
+MAX_CATCH_UP_TICKS = 5
+# Moves longer than this between two ticks (serves, resets) are jumps, not
+# motion, and aren't interpolated
+MAX_INTERPOLATED_MOVE = 60
+
+
+def init_ui():
+    """
+    Start the pygame subsystems the front end uses, display and font (not
+    audio, which nothing plays), and load the fonts. Importing this module
+    initializes nothing, so simulation code can use it without a display or
+    sound device.
+    """
+    global FONT, TITLE_FONT, SMALL_FONT
+    if FONT is not None:
+        return
+    pygame.display.init()
+    pygame.font.init()
+    FONT = pygame.font.Font(None, 36)
+    TITLE_FONT = pygame.font.Font(None, 72)
+    SMALL_FONT = pygame.font.Font(None, 20)
+
+
+def interpolate(previous, current, alpha):
+    """The rect alpha of the way from previous to current."""
+    if abs(current.x - previous.x) > MAX_INTERPOLATED_MOVE or abs(current.y - previous.y) > MAX_INTERPOLATED_MOVE:
+        return current
+    return current.move(round((previous.x - current.x) * (1 - alpha)), round((previous.y - current.y) * (1 - alpha)))
+
+
+class Game:
+    """
+    The pygame front end. The match runs on a fixed-timestep accumulator:
+    each frame adds the real time that passed and simulates as many whole
+    ticks as it covers, so the game plays the same at any render_fps. The
+    ball and paddles are drawn interpolated between the last two ticks.
+
+    With profile set, every frame is timed phase by phase (see
+    pong_profiler) and F3 toggles the profiler overlay. Matches report
+    their events to event_log, if given. Every match played is recorded
+    (see pong_replay), and a recording can be played back with run(replay).
+
+    The window is opened here unless a screen surface to draw on is given.
+    """
+
+    def __init__(self, dirty_rects=True, render_fps=FPS, profile=False, event_log=None, screen=None):
+        init_ui()
+        if screen is None:
+            screen = pygame.display.set_mode((WIDTH, HEIGHT))
+            pygame.display.set_caption("Pong: Chaos Edition")
+        self.screen = screen
+        self.clock = pygame.time.Clock()
+        self.render_fps = render_fps
+        self.frame_start = None
+        self.accumulator = 0.0
+        self.previous_rects = None
+        self.profiler = Profiler() if profile else None
+        self.profiled_match = None
+        self.event_log = event_log
+        self.recording = None
+        # While watching a replay: the recording and the next tick to play
+        self.replaying = None
+        self.replay_tick = 0
+        self.match = Match()
+        self.scenes = SceneStack()
+        self.text = TextCache()
+        # HUD surfaces, re-rendered only when the values they show change
+        self.score_values = None
+        self.score_surfaces = None
+        self.progress_values = None
+        self.progress_surface = None
+        self.renderer = DirtyRenderer(self.screen, self.make_background(), enabled=dirty_rects)
+        explosion = Explosion()
+        self.sprites = SpriteAtlas(explosion_radii=range(explosion.radius, explosion.max_radius + explosion.growth_rate,
+                                                         explosion.growth_rate))
+
+    def make_background(self):
+        """The parts of the play field that never move."""
+        background = pygame.Surface((WIDTH, HEIGHT)).convert()
+        background.fill(BLACK)
+        pygame.draw.aaline(background, WHITE, (WIDTH // 2, 0), (WIDTH // 2, HEIGHT))
+        return background
+
+    def display_score(self):
+        values = (self.match.player_score, self.match.cpu_score)
+        if values != self.score_values:
+            self.score_values = values
+            self.score_surfaces = (
+                self.text.render(FONT, f"{values[0]}", True, WHITE),
+                self.text.render(FONT, f"{values[1]}", True, WHITE),
+            )
+        player_text, cpu_text = self.score_surfaces
+        self.renderer.blit(player_text, (WIDTH - 50, 10))
+        self.renderer.blit(cpu_text, (30, 10))
+
+    def display_game_progress(self):
+        """Display the game progress for BO3 or BO5."""
+        if self.match.game_mode in ["bo3", "bo5"]:
+            values = (self.match.player_games_won, self.match.cpu_games_won)
+            if values != self.progress_values:
+                self.progress_values = values
+                self.progress_surface = self.text.render(FONT, f"Games Won - Player: {values[0]} | CPU: {values[1]}", True, WHITE)
+            progress_text = self.progress_surface
+            self.renderer.blit(progress_text, (WIDTH // 2 - progress_text.get_width() // 2, 30))
+
+    def moving_rects(self):
+        match = self.match
+        return match.ball.rect.copy(), match.player_paddle.rect.copy(), match.cpu_paddle.rect.copy()
+
+    def draw(self, alpha=1.0):
+        match = self.match
+        add = self.renderer.add
+        blit = self.renderer.blit
+        sprites = self.sprites
+        ball_rect, player_rect, cpu_rect = self.moving_rects()
+        if self.previous_rects is not None:
+            ball_rect, player_rect, cpu_rect = (
+                interpolate(previous, current, alpha)
+                for previous, current in zip(self.previous_rects, (ball_rect, player_rect, cpu_rect))
+            )
+        self.renderer.begin()
+        for paddle, rect in ((match.player_paddle, player_rect), (match.cpu_paddle, cpu_rect)):
+            if paddle.active:
+                add(pygame.draw.rect(self.screen, WHITE, rect))
+        if not match.dodgeball_mode and match.phase != "explosion":
+            blit(sprites.ball[RED if match.gimmick_active == "hot_potato" else WHITE], ball_rect)
+        self.display_score()
+        self.display_game_progress()
+
+        if match.dodgeball_mode:
+            for dodgeball in match.dodgeballs:
+                blit(sprites.dodgeball[RED], dodgeball.rect)
+
+        for chaos_object in match.chaos_objects:
+            add(pygame.draw.rect(self.screen, BLUE, chaos_object.rect))
+
+        for explosion in match.explosions:
+            frame = sprites.explosion_frame(explosion.radius)
+            if frame is not None:
+                blit(frame, (explosion.x - explosion.radius, explosion.y - explosion.radius))
+            else:
+                add(pygame.draw.circle(self.screen, RED, (explosion.x, explosion.y), explosion.radius, 2))
+                add(pygame.draw.circle(self.screen, WHITE, (explosion.x, explosion.y), explosion.radius // 2))
+
+    def title_screen(self):
+        Menu(self.screen, self.text, [
+            (TITLE_FONT, "Pong: Chaos Edition", -100),
+            (FONT, "Press any key to start", 50),
+        ], any_key=True).run()
+
+    def choose_classic_mode(self):
+        self.match.classic_mode = Menu(self.screen, self.text, [
+            (TITLE_FONT, "Select Mode", -100),
+            (FONT, "1. Classic Mode", 0),
+            (FONT, "2. Chaos Mode", 50),
+        ], keys={pygame.K_1: True, pygame.K_2: False}).run()
+
+    def choose_game_mode(self):
+        self.match.game_mode = Menu(self.screen, self.text, [
+            (TITLE_FONT, "Choose Game Mode", -100),
+            (FONT, "1. Single Play", 0),
+            (FONT, "2. Best of 3", 50),
+            (FONT, "3. Best of 5", 100),
+        ], keys={pygame.K_1: "single_play", pygame.K_2: "bo3", pygame.K_3: "bo5"}).run()
+
+    def choose_difficulty(self):
+        difficulty = Menu(self.screen, self.text, [
+            (TITLE_FONT, "Select Difficulty", -100),
+            (FONT, "1. Easy", 0),
+            (FONT, "2. Medium", 50),
+            (FONT, "3. Hard", 100),
+            (FONT, "4. Pro", 150),
+            (FONT, "5. Expert", 200),
+        ], keys={pygame.K_1: "easy", pygame.K_2: "medium", pygame.K_3: "hard", pygame.K_4: "pro",
+                 pygame.K_5: "expert"}).run()
+        self.match.cpu_speed, self.match.cpu_controller = pong_ai.for_difficulty(difficulty)
+
+    def pause_menu(self):
+        menu = Menu(self.screen, self.text, [
+            (TITLE_FONT, "Game Paused", -150),
+            (FONT, "1. Continue", -50),
+            (FONT, "2. Restart", 0),
+            (FONT, "3. Return to the Main Menu", 50),
+            (FONT, "4. Quit the Game", 100),
+        ], keys={pygame.K_1: "continue", pygame.K_2: "restart", pygame.K_3: "menu", pygame.K_4: "quit"})
+        while True:
+            choice = menu.run()
+            if choice == "continue":
+                return choice
+            elif choice == "restart":
+                if self.confirm_action("Restart"):
+                    return choice
+            elif choice == "menu":
+                if self.confirm_action("Return to the Main Menu"):
+                    return choice
+            elif choice == "quit":
+                if self.confirm_action("Quit the Game"):
+                    return choice
+
+    def confirm_action(self, action_text):
+        return Menu(self.screen, self.text, [
+            (FONT, f"Are you sure you want to {action_text}?", -50),
+            (FONT, "1. Yes", 0),
+            (FONT, "2. No", 50),
+        ], keys={pygame.K_1: True, pygame.K_2: False}).run()
+
+    def game_over_screen(self):
+        winner = self.match.winner()
+        return Menu(self.screen, self.text, [
+            (TITLE_FONT, f"{winner} Wins!", -100),
+            (FONT, "Press R to Restart or Q to Quit", 50),
+        ], keys={pygame.K_r: "restart", pygame.K_q: "quit"}).run()
+
+    def resume(self):
+        """Pick the match back up after a menu: full redraw, and the time spent away doesn't count."""
+        self.renderer.invalidate()
+        self.frame_start = None
+        self.accumulator = 0.0
+        self.previous_rects = None
+        if self.profiler is not None and self.profiled_match is not self.match:
+            self.profiler.instrument(self.match)
+            self.profiled_match = self.match
+
+    def play_frame(self):
+        """Run one frame of the match. Returns False once the window is closed."""
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.accumulator += now - self.frame_start
+        self.frame_start = now
+        profiler = self.profiler
+        if profiler is not None:
+            events_start = time.perf_counter_ns()
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_p:  # Pause the game
+                    if self.recording is not None:
+                        self.recording.mark(PAUSED)
+                    self.scenes.push(PauseScene(self))
+                    return True
+                elif event.key == pygame.K_F3 and profiler is not None:
+                    profiler.overlay = not profiler.overlay
+                    self.renderer.invalidate()
+        if profiler is not None:
+            profiler.add("events", time.perf_counter_ns() - events_start)
+
+        keys = pygame.key.get_pressed()
+        inputs = Inputs(keys[pygame.K_UP], keys[pygame.K_DOWN])
+        ticks = 0
+        while self.accumulator >= TICK_SECONDS:
+            if ticks == MAX_CATCH_UP_TICKS:
+                # Too far behind to catch up; drop the backlog
+                self.accumulator = 0.0
+                break
+            self.previous_rects = self.moving_rects()
+            if self.replaying is not None:
+                if self.replay_tick == len(self.replaying):
+                    self.scenes.reset()
+                    return True
+                apply(self.match, self.replaying.ticks[self.replay_tick])
+                self.replay_tick += 1
+            else:
+                if self.recording is not None:
+                    self.recording.record(inputs)
+                self.match.step(inputs)
+            self.accumulator -= TICK_SECONDS
+            ticks += 1
+            if self.match.finished:
+                self.scenes.replace(GameOverScene(self))
+                return True
+
+        if profiler is None:
+            self.draw(self.accumulator / TICK_SECONDS)
+            self.renderer.present()
+        else:
+            start = time.perf_counter_ns()
+            self.draw(self.accumulator / TICK_SECONDS)
+            if profiler.overlay:
+                for rect in profiler.draw_overlay(self.screen, SMALL_FONT, self.text):
+                    self.renderer.add(rect)
+            middle = time.perf_counter_ns()
+            self.renderer.present()
+            profiler.add("draw", middle - start)
+            profiler.add("flip", time.perf_counter_ns() - middle)
+            profiler.end_frame()
+        self.clock.tick(self.render_fps)
+        return True
+
+    def run(self, replay=None):
+        """Play from the title screen, or just watch replay (a Recording) if given."""
+        if replay is None:
+            self.scenes.reset(TitleScene(self))
+        else:
+            self.replaying = replay
+            self.replay_tick = 0
+            self.match = replay.new_match(event_log=self.event_log)
+            self.resume()
+            self.scenes.reset(PlayScene(self))
+        while self.scenes:
+            self.scenes.top().update()
+
+
+class Scene:
+    def __init__(self, game):
+        self.game = game
+
+    def update(self):
+        """Run one step of this screen while it is on top of the stack."""
+
+
+class TitleScene(Scene):
+    def update(self):
+        self.game.title_screen()
+        self.game.scenes.replace(ModeSelectScene(self.game))
+
+
+class ModeSelectScene(Scene):
+    def update(self):
+        game = self.game
+        game.match = Match(event_log=game.event_log)
+        game.choose_classic_mode()
+        game.choose_game_mode()
+        game.choose_difficulty()
+        game.recording = Recording.from_match(game.match)
+        game.resume()
+        game.scenes.replace(PlayScene(game))
+
+
+class PlayScene(Scene):
+    def update(self):
+        if not self.game.play_frame():
+            self.game.scenes.reset()
+
+
+class PauseScene(Scene):
+    def update(self):
+        game = self.game
+        choice = game.pause_menu()
+        if choice == "continue":
+            game.scenes.pop()
+        elif choice == "restart":
+            if game.recording is not None:
+                game.recording.mark(RESTART)
+            game.match.reset_game_state()
+            game.scenes.pop()
+        elif choice == "menu":
+            game.scenes.reset(TitleScene(game))
+        elif choice == "quit":
+            game.scenes.reset()
+        game.resume()
+
+
+class GameOverScene(Scene):
+    def update(self):
+        game = self.game
+        if game.game_over_screen() == "restart":
+            game.scenes.reset(TitleScene(game))
+        else:
+            game.scenes.reset()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pong: Chaos Edition")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="time every frame and write the samples to PATH (.csv or .json) on exit")
+    parser.add_argument("--record", metavar="PATH", help="save a replay of the last match played to PATH")
+    parser.add_argument("--replay", metavar="PATH", help="watch a replay saved with --record")
+    parser.add_argument("--event-log", metavar="PATH", help="write game events to PATH as JSON lines")
+    parser.add_argument("--log-level", choices=sorted(LEVELS, key=LEVELS.get), default="info",
+                        help="lowest event level to log (default: info)")
+    args = parser.parse_args()
+
+    event_log = EventLog(args.event_log, LEVELS[args.log_level]) if args.event_log else None
+    game = Game(profile=args.profile is not None, event_log=event_log)
+    # Closing the window on a menu exits with SystemExit, which still has to
+    # save the recording and profile and flush the event log
+    try:
+        game.run(Recording.load(args.replay) if args.replay else None)
+    finally:
+        if args.record and game.recording is not None:
+            game.recording.save(args.record)
+        if args.profile:
+            game.profiler.export(args.profile)
+        if event_log is not None:
+            event_log.close()
+        pygame.quit()
+
+    
+
+    
+
+
+
+
+
+
+
+#Update Notes:
+#Fixed issue with crashing when the Hot Potato Ball gets into contact with the paddle
+#Fixed Collision issues
+#Hit Counter is now exclusive to hot potato and ball won't explode when in contact with the Chaos Object
+#Fixed Scoring bug to where the point is awarded to the wrong player
+#Added the option to choose from classic mode and chaos mode
+#Added the Pause Menu function
+#Dodgeball mechanic implemented
+#Speed Increase and Speed Decrese Gimmicks implemented affecting both paddles and the balls
+#Minor bug fixes with hot potato causing a softlock
+#Added a brief pause when the Hot Potato hits the goal
+#Fast balls no longer tunnel through or stick in a paddle (swept collisions); a paddle moving onto a slow ball can still overlap it for a few frames
+
+
+
+#TODOS:
+
+#Bugs present in the code:
+#Hot Potato Explodes too early on contact with the Paddle
+
+
+#Gimmicks to implement:
+#1. Reverse Controls
+#2. Invisible Ball for a set amount of time or if it hits the goal
+#3. Lucky Score goes to the last paddle the ball makes contact with (low chance)
+#4. Penalty Score to the last paddle the ball makes contact with (higher chance)
+
+#Tips for implementing the gimmicks:
+#Make sure the gimmicks are connected to the Chaos Object, there will be a logic error if they aren't connected to the Chaos Object.
+#If running into issues, use AI to diagnose the problem and troubleshoot. Also analyze the code to ensure nothing is out of the oridinary
+#If running into further trouble, reach out on Discord so we can troubleshoot the problem together.
+
+
+#Misc:
+#Add a text that tells the player which gimmick is activiated for a couple of seconds
+#Add more notes for clarity
+#Review the code to make sure everything looks nice and presentable once all of the gimmicks are implemented
+#Tweak the Game Over Menu to ask the player "Are You Sure" much like the Pause Menu
+#Once the code is complete, remove any debugging code to make the project ready to be submitted
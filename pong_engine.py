@@ -0,0 +1,694 @@
+"""
+Headless simulation core for Pong: Chaos Edition.
+
+Everything that decides what happens in a match lives here: the ball, the
+paddles, the chaos objects and their gimmicks, dodgeballs, explosions and the
+scoring rules. Nothing in this module opens a window, reads the keyboard or
+waits on a clock, so a match can be stepped as fast as the CPU allows.
+Only pygame.Rect is used; no pygame subsystem is ever initialized.
+The pygame front end in pong_chaos_edition.py feeds Inputs into Match.step
+and draws whatever state comes back.
+"""
+import os
+import random
+from collections import namedtuple
+
+# Keep importing the engine quiet: pygame prints a banner on import otherwise
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+
+from pong_collision import SpatialHash, bounce_apart, sweep_aabb
+from pong_events import DEBUG, INFO
+from pong_pool import Pool, compact
+from pong_timers import Scheduler
+
+# Screen dimensions and constants
+WIDTH, HEIGHT = 800, 600
+BALL_SPEED = 5
+PADDLE_SPEED = 6
+FPS = 60
+WINNING_SCORE = 5  # Winning score per game
+MAX_BOUNCES = 4  # Collisions resolved per ball sweep
+
+DIFFICULTY_SPEEDS = {
+    "easy": 3,
+    "medium": 5,
+    "hard": 7
+}
+
+
+def ms_to_ticks(ms):
+    """Convert a duration in milliseconds to simulation ticks."""
+    return int(ms * FPS // 1000)
+
+
+# Keys held by the human player on a given tick
+Inputs = namedtuple("Inputs", ["up", "down"])
+NO_INPUT = Inputs(False, False)
+
+
+class Ball:
+    def __init__(self, rng=random):
+        self.rng = rng
+        self.rect = pygame.Rect(WIDTH // 2 - 15, HEIGHT // 2 - 15, 30, 30)
+        # Sub-pixel position of the top-left corner; rect is this rounded
+        self.x, self.y = self.rect.topleft
+        self.speed_x = BALL_SPEED * rng.choice((1, -1))
+        self.speed_y = BALL_SPEED * rng.choice((1, -1))
+        self.hot_potato_hits = 0
+        self.last_touched_by = None
+
+    def move(self):
+        self.rect.x += self.speed_x
+        self.rect.y += self.speed_y
+        self.x, self.y = self.rect.topleft
+        self.clamp_speed()
+
+    def clamp_speed(self):
+        max_speed = 10
+        self.speed_x = max(-max_speed, min(max_speed, self.speed_x))
+        self.speed_y = max(-max_speed, min(max_speed, self.speed_y))
+
+    def sweep(self, match, frames=1):
+        """
+        Continuous version of move() + wall_collision() + paddle_collision().
+        The ball travels frames frames' worth of its velocity in float
+        coordinates, stopping at the exact time of impact with a wall or
+        paddle, reflecting off the face it hit and carrying on with the time
+        left. Nothing is skipped however fast the ball or long the step.
+        """
+        size = self.rect.width
+        paddles = (match.player_paddle, match.cpu_paddle)
+        remaining = frames
+        for _ in range(MAX_BOUNCES):
+            t_hit = remaining
+            hit = None
+            if self.speed_y < 0:
+                t = max(0.0, (0 - self.y) / self.speed_y)
+                if t < t_hit:
+                    t_hit, hit = t, "top"
+            elif self.speed_y > 0:
+                t = max(0.0, (HEIGHT - size - self.y) / self.speed_y)
+                if t < t_hit:
+                    t_hit, hit = t, "bottom"
+            for paddle in paddles:
+                impact = sweep_aabb(self.x, self.y, size, size, self.speed_x, self.speed_y, paddle.rect, t_hit)
+                if impact is not None:
+                    t_hit, hit = impact[0], (paddle, impact[1], impact[2])
+
+            self.x += self.speed_x * t_hit
+            self.y += self.speed_y * t_hit
+            remaining -= t_hit
+            if hit is None:
+                break
+            if hit == "top":
+                self.speed_y = abs(self.speed_y)
+                match.emit(DEBUG, "bounce", wall="top", x=self.x, y=self.y)
+            elif hit == "bottom":
+                self.speed_y = -abs(self.speed_y)
+                match.emit(DEBUG, "bounce", wall="bottom", x=self.x, y=self.y)
+            else:
+                paddle, nx, ny = hit
+                if nx:
+                    self.speed_x = abs(self.speed_x) * nx
+                else:
+                    self.speed_y = abs(self.speed_y) * ny
+                self.register_hit(paddle, match)
+
+        self.rect.x = self.x
+        self.rect.y = self.y
+        self.clamp_speed()
+
+    def reset(self):
+        self.rect.center = (WIDTH // 2, HEIGHT // 2)
+        self.x, self.y = self.rect.topleft
+        self.speed_x = BALL_SPEED * self.rng.choice((1, -1))
+        self.speed_y = BALL_SPEED * self.rng.choice((1, -1))
+        self.hot_potato_hits = 0
+        self.last_touched_by = None
+
+    def wall_collision(self, match):
+
+        if self.rect.top < 0:
+            match.emit(DEBUG, "bounce", wall="top", x=self.rect.x, y=self.rect.y)
+            self.rect.top = 0
+            self.y = 0
+            self.speed_y = abs(self.speed_y)
+        elif self.rect.bottom > HEIGHT:
+            match.emit(DEBUG, "bounce", wall="bottom", x=self.rect.x, y=self.rect.y)
+            self.rect.bottom = HEIGHT
+            self.y = self.rect.y
+            self.speed_y = -abs(self.speed_y)
+
+    def paddle_collision(self, paddle, match):
+        if self.rect.colliderect(paddle.rect):
+            self.speed_x *= -1
+            self.register_hit(paddle, match)
+
+    def register_hit(self, paddle, match):
+        self.last_touched_by = "player" if paddle.rect.x > WIDTH // 2 else "cpu"
+        match.emit(DEBUG, "paddle_hit", paddle=self.last_touched_by, x=self.x, y=self.y)
+
+        # Increment hit counter only if hot potato is active
+        if match.gimmick_active == "hot_potato" and not match.dodgeball_mode:
+            self.hot_potato_hits += 1
+
+
+class Paddle:
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, 10, 140)
+        self.active = True
+
+    def reset(self):
+        self.rect.y = HEIGHT // 2 - self.rect.height // 2
+        self.active = True
+
+    def move(self, up, down, match):
+        current_speed = match.paddle_speed + (2 if match.dodgeball_mode else 0)
+        if up and self.rect.top > 0:
+            self.rect.y -= current_speed
+        if down and self.rect.bottom < HEIGHT:
+            self.rect.y += current_speed
+
+    def auto_move(self, ball, match, speed=None):
+        current_speed = (match.cpu_speed if speed is None else speed) + (2 if match.dodgeball_mode else 0)
+        if self.rect.centery < ball.rect.centery and self.rect.bottom < HEIGHT:
+            self.rect.y += current_speed
+        elif self.rect.centery > ball.rect.centery and self.rect.top > 0:
+            self.rect.y -= current_speed
+
+
+class ChaosObject:
+    __slots__ = ("rect", "gimmick")
+
+    def __init__(self, rng=None):
+        self.rect = pygame.Rect(0, 0, 40, 40)
+        self.gimmick = None
+        if rng is not None:
+            self.spawn(rng)
+
+    def spawn(self, rng):
+        """Drop the object somewhere new with a new gimmick (pooled objects are reused)."""
+        self.rect.topleft = (rng.randint(100, WIDTH - 140), rng.randint(50, HEIGHT - 90))
+        self.gimmick = ChaosObject.randomize_gimmick(rng)
+        return self
+
+    @staticmethod
+    def randomize_gimmick(rng=random):
+        return rng.choice(["hot_potato", "dodgeball", "speed_change_increase", "speed_change_decrease"])
+
+
+class Explosion:
+    __slots__ = ("x", "y", "radius", "max_radius", "growth_rate", "active")
+
+    def __init__(self, x=0, y=0):
+        self.spawn(x, y)
+
+    def spawn(self, x, y):
+        self.x = x
+        self.y = y
+        self.radius = 10
+        self.max_radius = 80
+        self.growth_rate = 8
+        self.active = True
+        return self
+
+    def update(self):
+
+        if self.radius < self.max_radius:
+            self.radius += self.growth_rate
+        else:
+            self.active = False
+
+
+class Dodgeball:
+    __slots__ = ("rect", "speed_x", "speed_y")
+
+    def __init__(self, x=0, y=0, speed_x=0, speed_y=0):
+        self.rect = pygame.Rect(x, y, 15, 15)
+        self.speed_x = speed_x
+        self.speed_y = speed_y
+
+    def spawn(self, x, y, speed_x, speed_y):
+        self.rect.topleft = (x, y)
+        self.speed_x = speed_x
+        self.speed_y = speed_y
+        return self
+
+    def move(self):
+        self.rect.x += self.speed_x
+        self.rect.y += self.speed_y
+
+    def wall_collision(self):
+        if self.rect.top <= 0 or self.rect.bottom >= HEIGHT:
+            self.speed_y *= -1
+        if self.rect.left <= 0 or self.rect.right >= WIDTH:
+            self.speed_x *= -1
+
+
+class Match:
+    """
+    The full rules of one match (a single game, BO3 or BO5), advanced one
+    tick at a time by step(). Timings are counted in ticks, not wall time.
+
+    With swept_collisions the ball moves in float coordinates and is swept
+    against the walls and paddles (Ball.sweep), which also lets step() cover
+    several frames at once. Without it the ball uses the original per-frame
+    overlap tests.
+
+    Game events go to event_log (a pong_events.EventLog) if one is given.
+
+    The CPU paddle chases the ball with Paddle.auto_move unless a
+    cpu_controller (see pong_ai) is given, in which case its
+    move(paddle, match) drives the paddle every frame instead.
+
+    Every random draw comes from self.rng, seeded with seed (a fresh one is
+    picked if it isn't given), so a match is fully determined by its seed,
+    its settings and the inputs fed to step(). See pong_replay.
+    """
+
+    def __init__(self, classic_mode=False, game_mode="single_play", cpu_speed=DIFFICULTY_SPEEDS["medium"],
+                 player_auto=False, dodgeball_count=5, dodgeball_collisions=False, max_chaos_objects=1,
+                 swept_collisions=True, event_log=None, seed=None, cpu_controller=None):
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.ball = Ball(self.rng)
+        self.player_paddle = Paddle(WIDTH - 20, HEIGHT // 2 - 70)
+        self.cpu_paddle = Paddle(10, HEIGHT // 2 - 70)
+        self.scoring_paused = False
+        self.scoring_timer = None
+        self.player_score = 0
+        self.cpu_score = 0
+        self.cpu_speed = cpu_speed
+        # The player's paddle speed; speed changes scale it for this match only
+        self.paddle_speed = PADDLE_SPEED
+        self.chaos_objects = []
+        self.max_chaos_objects = max_chaos_objects
+        self.gimmick_active = None
+        self.dodgeballs = []
+        self.dodgeball_mode = False
+        self.dodgeball_count = dodgeball_count
+        # Let dodgeballs bounce off each other
+        self.dodgeball_collisions = dodgeball_collisions
+        # Broad phase: chaos objects don't move, so their grid is only
+        # touched on spawn and removal; dodgeballs are re-filed every tick
+        self.chaos_grid = SpatialHash()
+        self.dodgeball_grid = SpatialHash(cell_size=32)
+        # Explosions, dodgeballs and chaos objects are recycled, not reallocated
+        self.chaos_pool = Pool(ChaosObject, max_chaos_objects)
+        self.dodgeball_pool = Pool(Dodgeball, dodgeball_count)
+        self.explosion_pool = Pool(Explosion, 2)
+        self.player_games_won = 0
+        self.cpu_games_won = 0
+        self.classic_mode = classic_mode
+        self.game_mode = game_mode
+        # Let the CPU logic drive the player paddle too (at paddle_speed)
+        self.player_auto = player_auto
+        self.swept_collisions = swept_collisions
+        self.event_log = event_log
+        self.cpu_controller = cpu_controller
+        self.explosions = []
+        self.speed_change_timer = None
+        self.original_speeds = {
+            "ball": (self.ball.speed_x, self.ball.speed_y),
+            "paddle": self.paddle_speed
+        }
+        self.tick = 0
+        self.timers = Scheduler()
+        self.finished = False
+        # "playing", or one of the freezes: "serving", "goal", "explosion"
+        self.phase = "playing"
+        self.phase_timer = None
+        self.phase_callback = None
+
+    def step(self, inputs=NO_INPUT, frames=1):
+        """
+        Advance the match by frames ticks (one by default) and return it.
+        A multi-frame step moves everything in one go and fires the timers
+        that came due at its end; it needs swept_collisions so the ball
+        can't jump over a paddle.
+        """
+        if frames > 1 and not self.swept_collisions:
+            raise ValueError("multi-frame steps need swept_collisions")
+        self.tick += frames
+        self.timers.advance(self.tick)
+
+        if self.phase == "playing":
+            self.update_play(inputs, frames)
+
+        if self.check_winning_conditions():
+            self.finished = True
+
+        for _ in range(frames):
+            for explosion in self.explosions:
+                explosion.update()
+        compact(self.explosions, self.explosion_pool)
+        return self
+
+    def update_play(self, inputs, frames=1):
+        if self.swept_collisions:
+            swept_from = self.ball.rect.copy()
+            self.ball.sweep(self, frames)
+        else:
+            self.ball.move()
+            self.ball.wall_collision(self)
+            self.ball.paddle_collision(self.player_paddle, self)
+            self.ball.paddle_collision(self.cpu_paddle, self)
+        for _ in range(frames):
+            if self.player_auto:
+                self.player_paddle.auto_move(self.ball, self, self.paddle_speed)
+            else:
+                self.player_paddle.move(inputs.up, inputs.down, self)
+            if self.cpu_controller is None:
+                self.cpu_paddle.auto_move(self.ball, self)
+            else:
+                self.cpu_controller.move(self.cpu_paddle, self)
+
+        if not self.classic_mode:
+            self.spawn_chaos_object(frames)
+            # Over several frames the ball may have passed right over a
+            # chaos object, so test the whole area it swept through
+            self.handle_chaos_collision(swept_from.union(self.ball.rect) if frames > 1 else self.ball.rect)
+            self.handle_hot_potato()
+            if self.phase != "playing":
+                return
+
+        if self.gimmick_active == "hot_potato":
+            self.update_hot_potato()
+        elif self.gimmick_active == "dodgeball":
+            for _ in range(frames):
+                self.handle_dodgeball_mode()
+                if self.phase != "playing":
+                    break
+        else:
+            self.update_normal_scoring()
+
+    def emit(self, level, event, **fields):
+        if self.event_log is not None:
+            self.event_log.emit(self.tick, level, event, fields)
+
+    def winner(self):
+        if self.game_mode == "single_play":
+            return "Player" if self.player_score > self.cpu_score else "CPU"
+        return "Player" if self.player_games_won > self.cpu_games_won else "CPU"
+
+    def freeze(self, phase, duration, then):
+        """
+        Hold play in the given phase for duration ms of simulation time,
+        then call then(). The ticks keep coming, so the front end keeps
+        drawing and polling input while the match is frozen.
+        """
+        self.timers.cancel(self.phase_timer)
+        self.phase = phase
+        self.phase_timer = self.timers.call_later(ms_to_ticks(duration), self.end_freeze)
+        self.phase_callback = then
+
+    def end_freeze(self):
+        callback = self.phase_callback
+        self.phase = "playing"
+        self.phase_timer = None
+        self.phase_callback = None
+        callback()
+
+    def reset_ball(self):
+        self.freeze("serving", 500, self.serve)
+
+    def serve(self):
+        self.ball.reset()
+        self.emit(INFO, "serve", speed_x=self.ball.speed_x, speed_y=self.ball.speed_y)
+        self.gimmick_active = None
+        self.clear_chaos_objects()
+
+    def reset_round(self):
+        self.ball.reset()
+        self.player_paddle.reset()
+        self.cpu_paddle.reset()
+
+    def spawn_chaos_object(self, frames=1):
+        chance = 0.01 if frames == 1 else 1 - 0.99 ** frames
+        if len(self.chaos_objects) < self.max_chaos_objects and self.gimmick_active is None and self.rng.random() < chance:
+            chaos_object = self.chaos_pool.acquire().spawn(self.rng)
+            self.chaos_objects.append(chaos_object)
+            self.chaos_grid.insert(chaos_object)
+
+    def clear_chaos_objects(self):
+        self.chaos_pool.release_all(self.chaos_objects)
+        self.chaos_grid.clear()
+
+    def handle_chaos_collision(self, area=None):
+        """
+        Handle collision with a chaos object.
+        Only activate hot potato without triggering an explosion.
+        """
+
+        hits = self.chaos_grid.query(self.ball.rect if area is None else area)
+        if hits:
+            # If the ball touches several at once, the oldest one wins
+            chaos_object = min(hits, key=self.chaos_objects.index)
+            if self.gimmick_active in ["speed_change_increase", "speed_change_decrease"]:
+                self.revert_speed_changes()
+
+            gimmick = chaos_object.gimmick
+            self.emit(INFO, "gimmick", gimmick=gimmick, x=chaos_object.rect.x, y=chaos_object.rect.y)
+            if gimmick == "hot_potato":
+                self.activate_hot_potato()
+            elif gimmick == "dodgeball":
+                self.activate_dodgeball()
+            elif gimmick == "speed_change_increase":
+                self.activate_speed_change(increase = True)
+            elif gimmick == "speed_change_decrease":
+                self.activate_speed_change(increase = False)
+            self.chaos_objects.remove(chaos_object)
+            self.chaos_grid.remove(chaos_object)
+            self.chaos_pool.release(chaos_object)
+
+    def activate_hot_potato(self):
+        """
+        Activate the "hot potato" gimmick. Speeds up the ball.
+        """
+        self.gimmick_active = "hot_potato"
+        self.ball.speed_x *= 1.3
+        self.ball.speed_y *= 1.3
+
+        max_speed = 10
+        self.ball.speed_x = max(-max_speed, min(max_speed, self.ball.speed_x))
+        self.ball.speed_y = max(-max_speed, min(max_speed, self.ball.speed_y))
+
+    def handle_hot_potato(self):
+        """
+        Handle the "hot potato" gimmick behavior:
+        - Reset hit counter on goal.
+        - Explode the ball after too many hits.
+        - Ensure opponent scores on goal.
+        """
+
+        if self.dodgeball_mode:
+            return
+
+        self.ball.wall_collision(self)
+
+        if self.gimmick_active == "hot_potato":
+            # Check for explosion after too many hits
+            if self.ball.hot_potato_hits >= 6:
+                self.explosions.append(self.explosion_pool.acquire().spawn(self.ball.rect.centerx,
+                                                                           self.ball.rect.centery))
+                self.emit(INFO, "explosion", last_touched_by=self.ball.last_touched_by,
+                          x=self.ball.rect.centerx, y=self.ball.rect.centery)
+
+                if self.ball.last_touched_by == "player":
+                    self.player_paddle.active = False
+                    self.cpu_score += 1
+                elif self.ball.last_touched_by == "cpu":
+                    self.cpu_paddle.active = False
+                    self.player_score += 1
+
+                self.freeze("explosion", 1000, self.end_explosion)
+
+    def end_explosion(self):
+        self.reset_round()
+        self.gimmick_active = None
+
+    def activate_dodgeball(self):
+        self.gimmick_active = "dodgeball"
+        self.dodgeball_mode = True
+        pool = self.dodgeball_pool
+        pool.release_all(self.dodgeballs)
+        grid = self.dodgeball_grid
+        grid.clear()
+        # A crowded field can run out of free spots; after this many misses
+        # the remaining dodgeballs go wherever they land
+        misses_left = 20 * self.dodgeball_count
+        new_dodgeball = None
+        while len(self.dodgeballs) < self.dodgeball_count:
+            x = self.rng.randint(50, WIDTH - 50)
+            y = self.rng.randint(50, HEIGHT - 50)
+            speed_x = self.rng.choice((-BALL_SPEED, BALL_SPEED))
+            speed_y = self.rng.choice((-BALL_SPEED, BALL_SPEED))
+
+            # A rejected candidate is re-spawned on the next try
+            if new_dodgeball is None:
+                new_dodgeball = pool.acquire()
+            new_dodgeball.spawn(x, y, speed_x, speed_y)
+            if misses_left <= 0 or not grid.collides(new_dodgeball.rect):
+                self.dodgeballs.append(new_dodgeball)
+                grid.insert(new_dodgeball)
+                new_dodgeball = None
+            else:
+                misses_left -= 1
+
+    def handle_dodgeball_mode(self):
+        grid = self.dodgeball_grid
+        grid.clear()
+        for dodgeball in self.dodgeballs:
+            dodgeball.move()
+            dodgeball.wall_collision()
+            grid.insert(dodgeball)
+
+        if self.dodgeball_collisions:
+            for a, b in grid.pairs():
+                bounce_apart(a, b)
+
+        # The first dodgeball (in list order) to touch a paddle decides the point
+        order = self.dodgeballs.index
+        hit_player = min(map(order, grid.query(self.player_paddle.rect)), default=None)
+        hit_cpu = min(map(order, grid.query(self.cpu_paddle.rect)), default=None)
+        if hit_player is not None and (hit_cpu is None or hit_player <= hit_cpu):
+            self.emit(INFO, "dodgeball_hit", paddle="player", x=self.player_paddle.rect.centerx,
+                      y=self.player_paddle.rect.centery)
+            self.cpu_score += 1
+            self.emit(INFO, "goal", scorer="cpu", gimmick="dodgeball")
+            self.freeze("goal", 500, self.reset_to_normal_mode)
+        elif hit_cpu is not None:
+            self.emit(INFO, "dodgeball_hit", paddle="cpu", x=self.cpu_paddle.rect.centerx,
+                      y=self.cpu_paddle.rect.centery)
+            self.player_score += 1
+            self.emit(INFO, "goal", scorer="player", gimmick="dodgeball")
+            self.freeze("goal", 500, self.reset_to_normal_mode)
+
+    def clear_dodgeballs(self):
+        self.dodgeball_pool.release_all(self.dodgeballs)
+        self.dodgeball_grid.clear()
+        self.dodgeball_mode = False
+
+    def reset_to_normal_mode(self):
+        self.clear_dodgeballs()
+        self.gimmick_active = None
+        self.reset_ball()
+
+    def activate_speed_change(self, increase = True):
+        factor = 3 if increase else 0.3
+        self.gimmick_active = "speed_change_increase" if increase else "speed_change_decrease"
+
+        if "ball" not in self.original_speeds or "paddle" not in self.original_speeds:
+            self.original_speeds["ball"] = (self.ball.speed_x, self.ball.speed_y)
+            self.original_speeds["paddle"] = self.paddle_speed
+
+        self.ball.speed_x *= factor
+        self.ball.speed_y *= factor
+        self.cpu_speed *= factor
+        self.paddle_speed *= factor
+        self.timers.cancel(self.speed_change_timer)
+        self.speed_change_timer = self.timers.call_later(ms_to_ticks(5000) + 1, self.end_speed_change)
+
+    def end_speed_change(self):
+        self.revert_speed_changes()
+        self.speed_change_timer = None
+
+    def revert_speed_changes(self):
+        if self.speed_change_timer is not None and "paddle" in self.original_speeds:
+            self.emit(INFO, "speed_change_end", gimmick=self.gimmick_active)
+
+        if "ball" in self.original_speeds:
+            self.ball.speed_x, self.ball.speed_y = self.original_speeds["ball"]
+
+        if "paddle" in self.original_speeds:
+            self.paddle_speed = self.original_speeds["paddle"]
+            self.cpu_speed = DIFFICULTY_SPEEDS["medium"]
+
+        self.original_speeds.clear()
+
+    def update_normal_scoring(self):
+
+        if self.scoring_paused:
+            return
+
+        if self.ball.rect.right >= WIDTH:
+            self.cpu_score += 1
+            self.emit(INFO, "goal", scorer="cpu", gimmick=self.gimmick_active)
+            self.handle_scoring_event()
+        elif self.ball.rect.left <= 0:
+            self.player_score += 1
+            self.emit(INFO, "goal", scorer="player", gimmick=self.gimmick_active)
+            self.handle_scoring_event()
+
+    def handle_scoring_event(self):
+
+        self.scoring_paused = True
+        self.revert_speed_changes()
+        self.reset_ball()
+
+        self.timers.cancel(self.scoring_timer)
+        self.scoring_timer = self.timers.call_at(self.phase_timer.due + ms_to_ticks(1000), self.resume_scoring)
+
+    def resume_scoring(self):
+        self.scoring_paused = False
+        self.scoring_timer = None
+
+    def update_hot_potato(self):
+        if self.gimmick_active == "hot_potato":
+            if self.ball.rect.right >= WIDTH:
+                self.cpu_score += 1
+                self.emit(INFO, "goal", scorer="cpu", gimmick="hot_potato")
+                self.freeze("goal", 1000, self.cleanup_hot_potato)
+
+            elif self.ball.rect.left <= 0:
+                self.player_score += 1
+                self.emit(INFO, "goal", scorer="player", gimmick="hot_potato")
+                self.freeze("goal", 1000, self.cleanup_hot_potato)
+
+    def cleanup_hot_potato(self):
+        self.ball.hot_potato_hits = 0
+        self.gimmick_active = None
+        self.reset_round()
+
+    def reset_game_state(self):
+        self.player_score = 0
+        self.cpu_score = 0
+        self.player_games_won = 0
+        self.cpu_games_won = 0
+        # A restart can come in the middle of a freeze, so do here what the
+        # callbacks about to be cancelled would have done
+        self.reset_round()
+        self.gimmick_active = None
+        self.clear_chaos_objects()
+        self.clear_dodgeballs()
+        self.explosion_pool.release_all(self.explosions)
+        self.finished = False
+        self.timers.clear()
+        self.speed_change_timer = None
+        self.scoring_timer = None
+        self.scoring_paused = False
+        self.phase = "playing"
+        self.phase_timer = None
+        self.phase_callback = None
+
+        self.revert_speed_changes()
+
+    def check_winning_conditions(self):
+        if self.game_mode == "single_play":
+            return self.player_score >= WINNING_SCORE or self.cpu_score >= WINNING_SCORE
+        elif self.game_mode in ["bo3", "bo5"]:
+            if self.player_score >= WINNING_SCORE:
+                self.player_games_won += 1
+                self.reset_scores()
+            elif self.cpu_score >= WINNING_SCORE:
+                self.cpu_games_won += 1
+                self.reset_scores()
+
+            required_wins = 2 if self.game_mode == "bo3" else 3
+            return self.player_games_won == required_wins or self.cpu_games_won == required_wins
+
+    def reset_scores(self):
+        self.player_score = 0
+        self.cpu_score = 0
+        self.ball.reset()
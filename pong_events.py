@@ -0,0 +1,92 @@
+"""
+Structured game-event log.
+
+The engine reports what happens in a match (bounces, paddle hits, gimmick
+activations, dodgeball hits, the end of speed changes, goals, explosions,
+serves) as events instead of printing. emit() only filters by level and
+appends a tuple to a deque; formatting and file I/O happen on a background
+thread that drains the deque to a JSON lines file every flush_interval
+seconds, so a slow disk, pipe or terminal never stalls a frame.
+"""
+import json
+import threading
+from collections import deque
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+
+LEVEL_NAMES = {DEBUG: "debug", INFO: "info", WARNING: "warning"}
+LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+
+
+class EventLog:
+    """
+    Events below level are dropped in emit(). Call close() when done to
+    write out whatever is still queued.
+    """
+
+    def __init__(self, path, level=INFO, flush_interval=0.25):
+        self.path = path
+        self.level = level
+        self.flush_interval = flush_interval
+        self.written = 0
+        self._queue = deque()
+        self._stop = threading.Event()
+        self._file = open(path, "w")
+        self._thread = threading.Thread(target=self._drain_loop, name="event-log", daemon=True)
+        self._thread.start()
+
+    def emit(self, tick, level, event, fields):
+        if level >= self.level:
+            self._queue.append((tick, level, event, fields))
+
+    def _drain(self):
+        queue = self._queue
+        lines = []
+        while queue:
+            tick, level, event, fields = queue.popleft()
+            record = {"tick": tick, "level": LEVEL_NAMES.get(level, level), "event": event}
+            record.update(fields)
+            lines.append(json.dumps(record, separators=(",", ":")))
+        if lines:
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+            self.written += len(lines)
+
+    def _drain_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self._drain()
+
+    def close(self):
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join()
+        self._drain()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EventFanout:
+    """Match(event_log=...) that passes every event on to several sinks, each filtering by its own level."""
+
+    def __init__(self, *sinks):
+        self.sinks = sinks
+        self.level = min(sink.level for sink in sinks)
+
+    def emit(self, tick, level, event, fields):
+        for sink in self.sinks:
+            if level >= sink.level:
+                sink.emit(tick, level, event, fields)
+
+
+def read_events(path):
+    """Load a log written by EventLog back as a list of dicts."""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
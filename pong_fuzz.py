@@ -0,0 +1,356 @@
+"""
+Invariant fuzzer for the game rules.
+
+Plays headless matches with random settings and random held keys across a
+process pool, as fast as the engine goes, and checks the rules after every
+tick:
+
+    ball_in_paddle  the ball overlaps a paddle for at most one tick in a row
+    ball_speed      the ball's speed stays within Ball.clamp_speed's limit
+    paddle_bounds   both paddles stay on the screen
+    score_step      a score only goes up by one per goal or explosion
+    speed_revert    revert_speed_changes leaves original_speeds empty and
+                    the paddle speeds back where the match started
+
+Every case is a pong_replay Recording, so a failing one can be replayed bit
+for bit. The shortest failure of each invariant is shrunk (settings pulled
+back to the defaults, runs of input dropped, the tail cut off after the
+violation) and saved as a .rep file:
+
+    python pong_fuzz.py --seconds 60 --out fuzz/
+    python pong_fuzz.py --check fuzz/paddle_bounds.rep
+    python pong_replay.py fuzz/paddle_bounds.rep
+"""
+import os
+import random
+from array import array
+from collections import namedtuple
+
+from pong_engine import DIFFICULTY_SPEEDS, FPS, HEIGHT, Match
+from pong_events import INFO
+from pong_replay import DOWN, RESTART, UP, Recording, apply
+
+INVARIANTS = ("ball_in_paddle", "ball_speed", "paddle_bounds", "score_step", "speed_revert")
+# The limit in Ball.clamp_speed and activate_hot_potato
+MAX_SPEED = 10
+# Chance per tick of a restart (reset_game_state), as from the game over menu
+RESTART_CHANCE = 1 / 20000
+# Settings a shrunk case is pulled back to, where it still fails
+DEFAULT_SETTINGS = {
+    "classic_mode": False, "game_mode": "single_play", "cpu_speed": DIFFICULTY_SPEEDS["medium"],
+    "dodgeball_count": 5, "dodgeball_collisions": False, "max_chaos_objects": 1,
+}
+
+Violation = namedtuple("Violation", ["invariant", "tick", "detail"])
+
+
+class Checker:
+    """
+    Checks one match's invariants after each step. It is also the match's
+    event log, to count the goals scored in a step, and it wraps the
+    match's revert_speed_changes to check what it leaves behind.
+    """
+
+    level = INFO
+
+    def __init__(self, match, invariants=INVARIANTS):
+        self.invariants = set(invariants)
+        self.paddle_speed = match.paddle_speed
+        self.cpu_speed = match.cpu_speed
+        self.overlaps = {"player": 0, "cpu": 0}
+        self.scored = {"player": 0, "cpu": 0}
+        self.restart()
+        self.found = []
+        match.event_log = self
+        revert = match.revert_speed_changes
+
+        def checked_revert():
+            revert()
+            if "speed_revert" in self.invariants:
+                self.check_revert(match)
+        match.revert_speed_changes = checked_revert
+
+    def restart(self):
+        """The match is about to be reset with reset_game_state."""
+        self.scores = {"player": 0, "cpu": 0}
+        self.games = 0
+
+    def emit(self, tick, level, event, fields):
+        if event == "goal":
+            self.scored[fields["scorer"]] += 1
+        elif event == "explosion" and fields["last_touched_by"] is not None:
+            self.scored["cpu" if fields["last_touched_by"] == "player" else "player"] += 1
+
+    def fail(self, invariant, detail):
+        # Each invariant is reported once; after that it is no longer checked
+        if invariant in self.invariants:
+            self.invariants.discard(invariant)
+            self.found.append((invariant, detail))
+
+    def check_revert(self, match):
+        if match.original_speeds:
+            self.fail("speed_revert", f"original_speeds left as {match.original_speeds}")
+        elif match.paddle_speed != self.paddle_speed:
+            self.fail("speed_revert", f"paddle_speed {match.paddle_speed}, started at {self.paddle_speed}")
+        elif match.cpu_speed != self.cpu_speed:
+            self.fail("speed_revert", f"cpu_speed {match.cpu_speed}, started at {self.cpu_speed}")
+
+    def check(self, match):
+        """The invariants first broken by the step just taken (usually none)."""
+        invariants = self.invariants
+        ball = match.ball
+        if "ball_in_paddle" in invariants and match.phase == "playing":
+            for side, paddle in (("player", match.player_paddle), ("cpu", match.cpu_paddle)):
+                if ball.rect.colliderect(paddle.rect):
+                    self.overlaps[side] += 1
+                    if self.overlaps[side] > 1:
+                        self.fail("ball_in_paddle",
+                                  f"ball {tuple(ball.rect)} inside the {side} paddle {tuple(paddle.rect)} "
+                                  f"for {self.overlaps[side]} ticks")
+                else:
+                    self.overlaps[side] = 0
+        if "ball_speed" in invariants and max(abs(ball.speed_x), abs(ball.speed_y)) > MAX_SPEED:
+            self.fail("ball_speed", f"ball speed ({ball.speed_x}, {ball.speed_y}) over {MAX_SPEED}")
+        if "paddle_bounds" in invariants:
+            for side, paddle in (("player", match.player_paddle), ("cpu", match.cpu_paddle)):
+                if paddle.rect.top < 0 or paddle.rect.bottom > HEIGHT:
+                    self.fail("paddle_bounds", f"{side} paddle at y={paddle.rect.y}")
+        games = match.player_games_won + match.cpu_games_won
+        scores = {"player": match.player_score, "cpu": match.cpu_score}
+        if "score_step" in invariants:
+            for side, score in scores.items():
+                # Winning a game of a bo3/bo5 starts both scores again from 0
+                expected = 0 if games != self.games else self.scores[side] + self.scored[side]
+                if score != expected or self.scored[side] > 1:
+                    self.fail("score_step", f"{side} score went from {self.scores[side]} to {score} "
+                                                   f"with {self.scored[side]} goals")
+        self.scores = scores
+        self.games = games
+        self.scored["player"] = self.scored["cpu"] = 0
+        if not self.found:
+            return ()
+        # Stamped here rather than in fail(): a restart's revert runs before step() moves the tick on
+        found = [Violation(invariant, match.tick, detail) for invariant, detail in self.found]
+        self.found = []
+        return found
+
+
+def random_settings(rng, swept_collisions=True):
+    return {
+        "classic_mode": rng.random() < 0.2,
+        "game_mode": rng.choice(("single_play", "bo3", "bo5")),
+        "cpu_speed": rng.choice(tuple(DIFFICULTY_SPEEDS.values())),
+        "player_auto": False,
+        "dodgeball_count": rng.randint(1, 8),
+        "dodgeball_collisions": rng.random() < 0.5,
+        "max_chaos_objects": rng.randint(1, 3),
+        "swept_collisions": swept_collisions,
+    }
+
+
+def run_case(seed, max_ticks, invariants=INVARIANTS, swept_collisions=True):
+    """
+    Play one random case to the end or max_ticks. Returns its recording and
+    the first violation of each invariant it broke.
+    """
+    rng = random.Random(seed)
+    match = Match(seed=seed, **random_settings(rng, swept_collisions))
+    recording = Recording.from_match(match)
+    checker = Checker(match, invariants)
+    ticks = recording.ticks
+    violations = []
+    flags, held = 0, 0
+    while match.tick < max_ticks and not match.finished:
+        if held == 0:
+            # Keys are held for a while, like a player's, rather than flickering every tick
+            flags = rng.choice((0, 0, UP, DOWN, UP | DOWN))
+            held = rng.randint(1, 40)
+        held -= 1
+        tick_flags = flags
+        if rng.random() < RESTART_CHANCE:
+            tick_flags |= RESTART
+            checker.restart()
+        ticks.append(tick_flags)
+        apply(match, tick_flags)
+        violations.extend(checker.check(match))
+        if not checker.invariants:
+            break
+    return recording, violations
+
+
+def check_recording(recording, invariants=INVARIANTS):
+    """The first violation of each invariant replaying recording breaks."""
+    match = recording.new_match()
+    checker = Checker(match, invariants)
+    violations = []
+    for flags in recording.ticks:
+        if flags & RESTART:
+            checker.restart()
+        apply(match, flags)
+        violations.extend(checker.check(match))
+        if match.finished or not checker.invariants:
+            break
+    return violations
+
+
+def truncated(recording, tick, settings=None, ticks=None):
+    """A copy of recording ending at tick, with other settings or ticks if given."""
+    ticks = recording.ticks if ticks is None else ticks
+    return Recording(recording.seed, recording.settings if settings is None else settings,
+                     recording.paddle_speed, ticks[:tick])
+
+
+def shrink(recording, violation, max_trials=400):
+    """
+    A smaller recording that still breaks violation's invariant, and its
+    violation. Settings go back to DEFAULT_SETTINGS one at a time, then
+    ever shorter runs of input are cleared (ddmin style); every candidate is
+    replayed, and the tail after its violation dropped.
+    """
+    invariants = (violation.invariant,)
+    best, found = truncated(recording, violation.tick), violation
+    trials = 0
+    for name, value in DEFAULT_SETTINGS.items():
+        if best.settings[name] == value:
+            continue
+        candidate = truncated(best, len(best), dict(best.settings, **{name: value}))
+        trials += 1
+        result = check_recording(candidate, invariants)
+        if result:
+            best, found = truncated(candidate, result[0].tick), result[0]
+
+    chunk = len(best) // 2
+    while chunk >= 1 and trials < max_trials:
+        start = 0
+        while start < len(best) and trials < max_trials:
+            if any(best.ticks[start:start + chunk]):
+                ticks = array("B", best.ticks)
+                end = min(start + chunk, len(ticks))
+                # Only the keys are cleared; restarts stay where they were
+                for index in range(start, end):
+                    ticks[index] &= ~(UP | DOWN)
+                candidate = truncated(best, len(ticks), ticks=ticks)
+                trials += 1
+                result = check_recording(candidate, invariants)
+                if result:
+                    best, found = truncated(candidate, result[0].tick), result[0]
+            start += chunk
+        chunk //= 2
+    return best, found
+
+
+def fuzz_chunk(first_seed, count, max_ticks, invariants=INVARIANTS, swept_collisions=True):
+    """
+    Run count cases. Returns (ticks played, {invariant: [failures, shortest
+    (violation, recording)]}).
+    """
+    played = 0
+    failures = {}
+    for seed in range(first_seed, first_seed + count):
+        recording, violations = run_case(seed, max_ticks, invariants, swept_collisions)
+        played += len(recording)
+        for violation in violations:
+            entry = failures.setdefault(violation.invariant, [0, None])
+            entry[0] += 1
+            if entry[1] is None or violation.tick < entry[1][0].tick:
+                entry[1] = (violation, truncated(recording, violation.tick))
+    return played, failures
+
+
+def fuzz(seconds=60, workers=None, chunk_size=20, seed=0, max_ticks=FPS * 60 * 5, invariants=INVARIANTS,
+         swept_collisions=True, shrink_trials=400, progress=print):
+    """
+    Fuzz for about seconds seconds across workers processes, then shrink the
+    shortest failure of each invariant. Returns (cases, ticks, {invariant:
+    (failures, violation, shrunk recording)}).
+    """
+    # Imported here so worker processes, which only need fuzz_chunk, start faster
+    import time
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    workers = workers or os.cpu_count()
+    deadline = time.monotonic() + seconds
+    next_seed = seed * 10 ** 9
+    cases = ticks = 0
+    failures = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running = set()
+        while running or time.monotonic() < deadline:
+            while time.monotonic() < deadline and len(running) < 2 * workers:
+                running.add(pool.submit(fuzz_chunk, next_seed, chunk_size, max_ticks, invariants,
+                                        swept_collisions))
+                next_seed += chunk_size
+            done, running = wait(running, timeout=max(0, deadline - time.monotonic()),
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                played, found = future.result()
+                cases += chunk_size
+                ticks += played
+                for invariant, (count, shortest) in found.items():
+                    entry = failures.setdefault(invariant, [0, None])
+                    entry[0] += count
+                    if entry[1] is None or shortest[0].tick < entry[1][0].tick:
+                        entry[1] = shortest
+            if progress is not None and done:
+                found = ", ".join(f"{name} x{count}" for name, (count, _) in sorted(failures.items()))
+                progress(f"{cases} cases, {ticks} ticks{': ' + found if found else ''}")
+
+        shrinking = {invariant: pool.submit(shrink, recording, violation, shrink_trials)
+                     for invariant, (_, (violation, recording)) in failures.items()}
+        results = {}
+        for invariant, future in shrinking.items():
+            recording, violation = future.result()
+            results[invariant] = (failures[invariant][0], violation, recording)
+    return cases, ticks, results
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import time
+
+    parser = argparse.ArgumentParser(description="Headless invariant fuzzer for the game rules")
+    parser.add_argument("--seconds", type=float, default=60, help="how long to fuzz (default: 60)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--chunk", type=int, default=20, help="cases per job (default: 20)")
+    parser.add_argument("--seed", type=int, default=0, help="base seed (default: 0)")
+    parser.add_argument("--max-minutes", type=float, default=5,
+                        help="stop a case after this much game time (default: 5)")
+    parser.add_argument("--invariants", nargs="+", choices=INVARIANTS, default=INVARIANTS,
+                        help="invariants to check (default: all)")
+    parser.add_argument("--unswept", action="store_true",
+                        help="use the per-frame collision checks instead of swept collisions")
+    parser.add_argument("--shrink-trials", type=int, default=400,
+                        help="replays allowed when shrinking each failure (default: 400)")
+    parser.add_argument("--out", metavar="DIR", default="fuzz", help="where to save shrunk failures (default: fuzz)")
+    parser.add_argument("--check", metavar="REPLAY", help="replay a saved recording and report what it breaks")
+    args = parser.parse_args()
+
+    if args.check:
+        violations = check_recording(Recording.load(args.check), args.invariants)
+        for violation in violations:
+            print(f"{violation.invariant} at tick {violation.tick}: {violation.detail}")
+        if not violations:
+            print("no violations")
+        sys.exit(1 if violations else 0)
+
+    start = time.perf_counter()
+    cases, ticks, results = fuzz(args.seconds, args.workers, args.chunk, args.seed, int(args.max_minutes * 60 * FPS),
+                                 args.invariants, not args.unswept, args.shrink_trials)
+    elapsed = time.perf_counter() - start
+    print(f"\n{cases} cases, {ticks} ticks in {elapsed:.1f} s ({ticks / elapsed:,.0f} ticks/s)")
+    if results:
+        os.makedirs(args.out, exist_ok=True)
+    for invariant, (count, violation, recording) in sorted(results.items()):
+        path = os.path.join(args.out, invariant + ".rep")
+        recording.save(path)
+        changed = {name: value for name, value in recording.settings.items()
+                   if name in DEFAULT_SETTINGS and value != DEFAULT_SETTINGS[name]}
+        print(f"{invariant}: {count} failing cases; shortest shrunk to {len(recording)} ticks, "
+              f"{sum(1 for flags in recording.ticks if flags)} with input, seed {recording.seed}"
+              f"{', settings ' + str(changed) if changed else ''}\n"
+              f"    tick {violation.tick}: {violation.detail}\n    saved to {path}")
+    for invariant in args.invariants:
+        if invariant not in results:
+            print(f"{invariant}: held")
+    sys.exit(1 if results else 0)
@@ -0,0 +1,98 @@
+"""
+Event-driven menu screens.
+
+A Menu draws its lines once and then sleeps in pygame.event.wait() until
+something happens, instead of redrawing and polling in a busy loop. It only
+redraws when the window needs repainting, so an idle menu uses next to no
+CPU.
+"""
+import sys
+
+import pygame
+
+from pong_render import BLACK, WHITE
+
+REDRAW_EVENTS = {pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWSHOWN}
+
+
+class Menu:
+    """
+    lines is a list of (font, text, y) with y measured from the vertical
+    center of the screen; every line is centered horizontally. keys maps
+    pygame key codes to the value run() returns for them. With any_key set,
+    run() returns on any key press instead.
+    """
+
+    def __init__(self, screen, text_cache, lines, keys=None, any_key=False):
+        self.screen = screen
+        self.text = text_cache
+        self.lines = lines
+        self.keys = keys or {}
+        self.any_key = any_key
+
+    def draw(self):
+        width, height = self.screen.get_size()
+        self.screen.fill(BLACK)
+        for font, text, y in self.lines:
+            surface = self.text.render(font, text, True, WHITE)
+            self.screen.blit(surface, (width // 2 - surface.get_width() // 2, height // 2 + y))
+        pygame.display.flip()
+
+    def run(self, timeout=None):
+        """
+        Show the menu and block until a mapped key is pressed. With a
+        timeout (in ms), return None if nothing was chosen in that time.
+        """
+        self.draw()
+        deadline = None if timeout is None else pygame.time.get_ticks() + timeout
+        while True:
+            if deadline is None:
+                event = pygame.event.wait()
+            else:
+                remaining = deadline - pygame.time.get_ticks()
+                if remaining <= 0:
+                    return None
+                event = pygame.event.wait(remaining)
+
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            elif event.type == pygame.KEYDOWN:
+                if self.any_key:
+                    return event.key
+                if event.key in self.keys:
+                    return self.keys[event.key]
+            elif event.type in REDRAW_EVENTS:
+                self.draw()
+
+
+class SceneStack:
+    """
+    The screens the front end is showing, topmost active. Switching scenes
+    is a push, pop or replace on a list, so restarting a match never grows
+    the Python stack or recreates the display.
+    """
+
+    def __init__(self):
+        self._scenes = []
+
+    def top(self):
+        return self._scenes[-1]
+
+    def push(self, scene):
+        self._scenes.append(scene)
+
+    def pop(self):
+        return self._scenes.pop()
+
+    def replace(self, scene):
+        self._scenes[-1] = scene
+
+    def reset(self, scene=None):
+        """Drop every scene, optionally starting over from a new one."""
+        self._scenes.clear()
+        if scene is not None:
+            self._scenes.append(scene)
+
+    def __len__(self):
+        return len(self._scenes)
@@ -0,0 +1,833 @@
+"""
+Networked two-player play over UDP with asyncio.
+
+The Server runs matches authoritatively at FPS ticks per second, one per
+room, as many rooms as clients ask for. The first client to join a room
+plays the right paddle; a second one takes over the left paddle from the
+CPU. Clients send their keys every tick, each packet
+repeating the last INPUT_WINDOW ticks' worth so a lost packet costs
+nothing. The server sends every client a snapshot every tick. Each snapshot
+is quantized and delta-encoded against the last snapshot that client
+acknowledged, so a typical one is a couple of dozen bytes: about 3 KB/s
+per client, UDP and IP headers included.
+
+A Client keeps a mirror Match that it draws from. Its own paddle is
+predicted: keys move it as soon as they're pressed, and when a snapshot
+says which input the server has got up to, the paddle is put where the
+server has it and the inputs since are replayed on top. Everything else
+is shown as the server last sent it, so it lags by about one round trip.
+
+LossyTransport drops and delays datagrams to try all this on localhost:
+
+    python pong_net.py loopback --loss 0.05 --latency 0.03 --jitter 0.02
+    python pong_net.py server
+    python pong_net.py client 127.0.0.1 --room 3
+    python pong_net.py loadtest --rooms 200
+    python pong_net.py roundtrip
+"""
+import asyncio
+import random
+import statistics
+import struct
+import sys
+import time
+import traceback
+from collections import deque
+
+from pong_ai import InterceptController
+from pong_engine import FPS, Inputs, Match
+from pong_events import WARNING
+from pong_replay import DOWN, UP
+from pong_snapshot import GAME_MODES, GIMMICKS, PHASES
+
+PORT = 50007
+TICK_SECONDS = 1 / FPS
+# Inputs repeated in every input packet
+INPUT_WINDOW = 16
+# Inputs the server lets queue up before skipping ahead to the newest
+MAX_QUEUED_INPUTS = 2
+# Seconds of silence before a client is dropped
+CLIENT_TIMEOUT = 5.0
+# How long the final score stays up before the server starts a new match
+GAME_OVER_TICKS = 3 * FPS
+# Snapshots kept as delta baselines, on both ends
+BASELINE_HISTORY = 2 * FPS
+# IPv4 and UDP headers, for bandwidth figures
+UDP_OVERHEAD = 28
+# Server ticks timed for load figures
+TICK_SAMPLES = 10 * FPS
+# Two-client rooms one core keeps at full tick rate, measured with
+# 'python pong_net.py loadtest' (about 20 us of match and encoding and
+# 55 us of socket work per room per tick)
+ROOMS_PER_CORE = 200
+
+HELLO, WELCOME, INPUT, SNAPSHOT, BYE, PAUSE = range(1, 7)
+SIDES = ("player", "cpu")
+
+TYPE = struct.Struct("<B")
+HELLO_MESSAGE = struct.Struct("<BI")  # type, room
+PAUSE_MESSAGE = struct.Struct("<B?")  # type, paused
+WELCOME_MESSAGE = struct.Struct("<BBHQB")  # type, side, tick rate, seed, game mode
+INPUT_MESSAGE = struct.Struct("<BIIB")  # type, newest input seq, newest snapshot tick seen, flags that follow
+SNAPSHOT_MESSAGE = struct.Struct("<BIIIH")  # type, tick, baseline tick (0: none), last input applied, fields present
+# Shortest well-formed message of each type a server accepts
+CLIENT_MESSAGE_SIZES = {HELLO: HELLO_MESSAGE.size, INPUT: INPUT_MESSAGE.size, PAUSE: PAUSE_MESSAGE.size,
+                        BYE: TYPE.size}
+# ... and a client accepts
+SERVER_MESSAGE_SIZES = {WELCOME: WELCOME_MESSAGE.size, SNAPSHOT: SNAPSHOT_MESSAGE.size}
+
+# Snapshot fields, in order; positions are whole pixels except the ball's quarter pixels
+SCALARS = tuple(struct.Struct("<" + code) for code in (
+    "h", "h",  # ball x, y
+    "h", "h",  # player paddle y, cpu paddle y
+    "B", "B", "B", "B",  # player_score, cpu_score, player_games_won, cpu_games_won
+    "B", "B",  # phase, gimmick_active
+    "B",  # dodgeball_mode, player active, cpu active, finished
+    "d",  # paddle_speed, for the clients' prediction
+))
+COUNT = struct.Struct("<B")
+RECORDS = (
+    struct.Struct("<hh"),  # dodgeballs: x, y
+    struct.Struct("<hhB"),  # chaos objects: x, y, gimmick
+    struct.Struct("<hhB"),  # explosions: x, y, radius
+)
+
+
+def whole_message(data, sizes):
+    """Whether data is at least as long as the message its type byte names, of the types in sizes."""
+    return bool(data) and len(data) >= sizes.get(data[0], len(data) + 1)
+
+
+def capture(match):
+    """The quantized state a snapshot carries, as a tuple of the fields above."""
+    ball, player, cpu = match.ball, match.player_paddle, match.cpu_paddle
+    return (
+        round(ball.x * 4), round(ball.y * 4), player.rect.y, cpu.rect.y,
+        match.player_score, match.cpu_score, match.player_games_won, match.cpu_games_won,
+        PHASES.index(match.phase), GIMMICKS.index(match.gimmick_active),
+        match.dodgeball_mode | player.active << 1 | cpu.active << 2 | match.finished << 3,
+        match.paddle_speed,
+        tuple((dodgeball.rect.x, dodgeball.rect.y) for dodgeball in match.dodgeballs),
+        tuple((chaos_object.rect.x, chaos_object.rect.y, GIMMICKS.index(chaos_object.gimmick))
+              for chaos_object in match.chaos_objects),
+        tuple((explosion.x, explosion.y, explosion.radius) for explosion in match.explosions),
+    )
+
+
+def encode(state, baseline=None):
+    """The fields of state that differ from baseline (all of them without one): (mask, bytes)."""
+    mask = 0
+    parts = []
+    for index, value in enumerate(state):
+        if baseline is not None and baseline[index] == value:
+            continue
+        mask |= 1 << index
+        if index < len(SCALARS):
+            parts.append(SCALARS[index].pack(value))
+        else:
+            record = RECORDS[index - len(SCALARS)]
+            parts.append(COUNT.pack(len(value)))
+            parts.extend(record.pack(*item) for item in value)
+    return mask, b"".join(parts)
+
+
+def decode(data, offset, mask, baseline=None):
+    """Undo encode(): the full state, taking fields missing from mask from baseline."""
+    state = []
+    for index in range(len(SCALARS) + len(RECORDS)):
+        if not mask & 1 << index:
+            state.append(baseline[index])
+        elif index < len(SCALARS):
+            state.append(SCALARS[index].unpack_from(data, offset)[0])
+            offset += SCALARS[index].size
+        else:
+            record = RECORDS[index - len(SCALARS)]
+            count = data[offset]
+            offset += COUNT.size
+            state.append(tuple(record.unpack_from(data, offset + i * record.size) for i in range(count)))
+            offset += count * record.size
+    return tuple(state)
+
+
+def apply_state(match, state):
+    """Show state on a (mirror) match, for drawing."""
+    (ball_x, ball_y, player_y, cpu_y,
+     match.player_score, match.cpu_score, match.player_games_won, match.cpu_games_won,
+     phase, gimmick, flags, match.paddle_speed, dodgeballs, chaos_objects, explosions) = state
+    ball = match.ball
+    ball.x, ball.y = ball_x / 4, ball_y / 4
+    ball.rect.topleft = (round(ball.x), round(ball.y))
+    match.player_paddle.rect.y = player_y
+    match.cpu_paddle.rect.y = cpu_y
+    match.phase = PHASES[phase]
+    match.gimmick_active = GIMMICKS[gimmick]
+    match.dodgeball_mode = bool(flags & 1)
+    match.player_paddle.active = bool(flags & 2)
+    match.cpu_paddle.active = bool(flags & 4)
+    match.finished = bool(flags & 8)
+
+    match.dodgeball_pool.release_all(match.dodgeballs)
+    for x, y in dodgeballs:
+        # Snapshots carry no velocities; the mirror only draws dodgeballs
+        match.dodgeballs.append(match.dodgeball_pool.acquire().spawn(x, y, 0, 0))
+    match.chaos_pool.release_all(match.chaos_objects)
+    for x, y, chaos_gimmick in chaos_objects:
+        chaos_object = match.chaos_pool.acquire()
+        chaos_object.rect.topleft = (x, y)
+        chaos_object.gimmick = GIMMICKS[chaos_gimmick]
+        match.chaos_objects.append(chaos_object)
+    match.explosion_pool.release_all(match.explosions)
+    for x, y, radius in explosions:
+        match.explosions.append(match.explosion_pool.acquire().spawn(x, y))
+        match.explosions[-1].radius = radius
+
+
+def check_roundtrip(ticks=FPS * 60, seed=0):
+    """
+    Play a headless match with dodgeball mode started whenever play allows,
+    and check every tick that its state survives capture, encode (in full
+    and against the previous tick), decode and apply_state on a mirror.
+    Returns the number of ticks that didn't.
+    """
+    match = Match(seed=seed, player_auto=True)
+    mirror = Match(seed=0)
+    failures = 0
+    previous = None
+    for _ in range(ticks):
+        if match.phase == "playing" and match.gimmick_active is None and not match.finished:
+            match.activate_dodgeball()
+        match.step()
+        state = capture(match)
+        for baseline in (None, previous):
+            mask, body = encode(state, baseline)
+            apply_state(mirror, decode(body, 0, mask, baseline))
+            if capture(mirror) != state:
+                failures += 1
+                break
+        previous = state
+        if match.finished:
+            match.reset_game_state()
+    return failures
+
+
+class LossyTransport:
+    """
+    Wraps a datagram transport and drops a loss fraction of what is sent
+    through it, delaying the rest by latency plus up to jitter seconds
+    (which reorders them, too).
+    """
+
+    def __init__(self, transport, loss=0.0, latency=0.0, jitter=0.0, seed=None):
+        self.transport = transport
+        self.loss = loss
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self.loop = asyncio.get_running_loop()
+
+    def sendto(self, data, *address):
+        if self.rng.random() < self.loss:
+            return
+        delay = self.latency + self.rng.uniform(0, self.jitter)
+        if delay > 0:
+            self.loop.call_later(delay, self._send, data, address)
+        else:
+            self._send(data, address)
+
+    def _send(self, data, address):
+        if not self.transport.is_closing():
+            self.transport.sendto(data, *address)
+
+    def close(self):
+        self.transport.close()
+
+    def is_closing(self):
+        return self.transport.is_closing()
+
+
+class RemotePaddle:
+    """Match(cpu_controller=...) that moves the left paddle with a remote player's keys."""
+
+    def __init__(self):
+        self.flags = 0
+
+    def move(self, paddle, match):
+        paddle.move(bool(self.flags & UP), bool(self.flags & DOWN), match)
+
+
+class Slot:
+    """The server's end of one client."""
+
+    def __init__(self, address, side, room):
+        self.address = address
+        self.side = side
+        self.room = room
+        self.paused = False
+        self.pending = {}
+        self.next_seq = 1
+        self.flags = 0
+        self.processed = 0
+        self.acked = 0
+        self.sent = {}
+        self.last_heard = time.monotonic()
+        self.bytes_sent = 0
+
+    def receive(self, seq, window, ack):
+        self.last_heard = time.monotonic()
+        first = seq - len(window) + 1
+        for offset, flags in enumerate(window):
+            if first + offset >= self.next_seq:
+                self.pending[first + offset] = flags
+        if ack > self.acked and ack in self.sent:
+            self.acked = ack
+            for tick in [tick for tick in self.sent if tick < ack]:
+                del self.sent[tick]
+
+    def take_input(self):
+        """The keys to use for this tick: the next input in order, or the last ones again if it hasn't come."""
+        pending = self.pending
+        while len(pending) > MAX_QUEUED_INPUTS:
+            del pending[min(pending)]
+        if pending and self.next_seq not in pending:
+            # Lost despite the redundancy, or skipped above
+            self.next_seq = min(pending)
+        flags = pending.pop(self.next_seq, None)
+        if flags is not None:
+            self.flags = flags
+            self.processed = self.next_seq
+            self.next_seq += 1
+        return self.flags
+
+
+class Room:
+    """One match and the (up to two) clients playing it."""
+
+    def __init__(self, room_id, match):
+        self.id = room_id
+        self.match = match
+        self.cpu = match.cpu_controller or InterceptController.for_difficulty("medium")
+        match.cpu_controller = self.cpu
+        self.remote = RemotePaddle()
+        self.slots = []
+        self.snapshot_tick = 0
+        self.finished_ticks = 0
+
+    @property
+    def paused(self):
+        return any(slot.paused for slot in self.slots)
+
+    def join(self, address):
+        taken = {slot.side for slot in self.slots}
+        free = [side for side in SIDES if side not in taken]
+        if not free:
+            return None
+        slot = Slot(address, free[0], self)
+        self.slots.append(slot)
+        if slot.side == "cpu":
+            self.match.cpu_controller = self.remote
+        return slot
+
+    def leave(self, slot):
+        self.slots.remove(slot)
+        if slot.side == "cpu":
+            self.match.cpu_controller = self.cpu
+
+    def tick(self, sendto):
+        """Step the match with the clients' next inputs and send them each a snapshot."""
+        match = self.match
+        player_flags = 0
+        for slot in self.slots:
+            if slot.side == "player":
+                player_flags = slot.take_input()
+            else:
+                self.remote.flags = slot.take_input()
+        if match.finished:
+            # Hold the final score, without stepping, until the next match starts
+            self.finished_ticks += 1
+            if self.finished_ticks > GAME_OVER_TICKS:
+                match.reset_game_state()
+                self.finished_ticks = 0
+        else:
+            match.step(Inputs(bool(player_flags & UP), bool(player_flags & DOWN)))
+        # Snapshots are numbered by room tick, which carries on while the match is held
+        self.snapshot_tick += 1
+
+        state = capture(match)
+        # Both clients have usually acknowledged the same snapshot
+        encoded = {}
+        for slot in self.slots:
+            baseline = slot.sent.get(slot.acked)
+            key = slot.acked if baseline else 0
+            if key not in encoded:
+                encoded[key] = encode(state, baseline)
+            mask, body = encoded[key]
+            packet = SNAPSHOT_MESSAGE.pack(SNAPSHOT, self.snapshot_tick, slot.acked if baseline else 0, slot.processed,
+                                           mask) + body
+            sendto(packet, slot.address)
+            slot.bytes_sent += len(packet) + UDP_OVERHEAD
+            slot.sent[self.snapshot_tick] = state
+            if len(slot.sent) > BASELINE_HISTORY:
+                del slot.sent[min(slot.sent)]
+
+
+class Server(asyncio.DatagramProtocol):
+    """
+    Hosts any number of rooms, each its own Match, on one socket. A client
+    names the room it wants in its hello; the room is created with
+    settings (Match keyword arguments) if it doesn't exist yet and is
+    dropped when its last client leaves. Every tick steps only the rooms
+    that are in play, one after another, so rooms with nobody in them or
+    that a client has paused cost nothing. A room whose match raises is
+    closed, with the error reported to event_log (or stderr), and the
+    others carry on.
+
+    One core keeps up with about ROOMS_PER_CORE (200) rooms of two
+    clients; see 'python pong_net.py loadtest'.
+    """
+
+    def __init__(self, settings=None, loss=0.0, latency=0.0, jitter=0.0, event_log=None):
+        self.settings = {} if settings is None else settings
+        # Where errors that close a room are reported (stderr without one)
+        self.event_log = event_log
+        self.impairment = (loss, latency, jitter)
+        self.transport = None
+        self.rooms = {}
+        self.clients = {}
+        self.ticks = 0
+        # Time spent in the last TICK_SAMPLES ticks, for load figures
+        self.tick_ns = deque(maxlen=TICK_SAMPLES)
+        self.running = True
+
+    def connection_made(self, transport):
+        self.transport = LossyTransport(transport, *self.impairment) if any(self.impairment) else transport
+
+    def datagram_received(self, data, address):
+        # Anything can turn up on an open port; drop what isn't a whole client message
+        if not whole_message(data, CLIENT_MESSAGE_SIZES):
+            return
+        kind = data[0]
+        slot = self.clients.get(address)
+        if kind == INPUT and slot is not None:
+            _, seq, ack, count = INPUT_MESSAGE.unpack_from(data)
+            window = data[INPUT_MESSAGE.size:INPUT_MESSAGE.size + count]
+            if len(window) == count:
+                slot.receive(seq, window, ack)
+        elif kind == HELLO:
+            if slot is None:
+                slot = self.join(address, HELLO_MESSAGE.unpack_from(data)[1])
+            if slot is not None:
+                match = slot.room.match
+                self.transport.sendto(WELCOME_MESSAGE.pack(WELCOME, SIDES.index(slot.side), FPS, match.seed,
+                                                           GAME_MODES.index(match.game_mode)), address)
+        elif kind == PAUSE and slot is not None:
+            slot.paused = bool(data[1])
+        elif kind == BYE and slot is not None:
+            self.leave(slot)
+
+    def room(self, room_id):
+        """The room with this id, opened if needed."""
+        room = self.rooms.get(room_id)
+        if room is None:
+            room = self.rooms[room_id] = Room(room_id, Match(**self.settings))
+        return room
+
+    def join(self, address, room_id=0):
+        slot = self.room(room_id).join(address)
+        if slot is not None:
+            self.clients[address] = slot
+        return slot
+
+    def leave(self, slot):
+        room = slot.room
+        room.leave(slot)
+        del self.clients[slot.address]
+        if not room.slots:
+            del self.rooms[room.id]
+
+    def close(self, room):
+        """Drop room and its clients."""
+        for slot in room.slots:
+            del self.clients[slot.address]
+        del self.rooms[room.id]
+
+    def report(self, room, error):
+        if self.event_log is not None:
+            self.event_log.emit(self.ticks, WARNING, "room_error", {"room": room.id, "error": repr(error)})
+        else:
+            print(f"Room {room.id} closed after an error:", file=sys.stderr)
+            traceback.print_exception(error)
+
+    def tick(self):
+        start = time.perf_counter_ns()
+        self.ticks += 1
+        if self.ticks % FPS == 0:
+            now = time.monotonic()
+            for slot in [slot for slot in self.clients.values() if now - slot.last_heard > CLIENT_TIMEOUT]:
+                self.leave(slot)
+        sendto = self.transport.sendto
+        for room in list(self.rooms.values()):
+            if not room.paused:
+                try:
+                    room.tick(sendto)
+                except Exception as error:
+                    # One broken match mustn't take every other room down with it
+                    self.report(room, error)
+                    self.close(room)
+        self.tick_ns.append(time.perf_counter_ns() - start)
+
+    async def run(self):
+        """Tick at FPS until stop()."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        ticks = 0
+        while self.running:
+            self.tick()
+            ticks += 1
+            delay = start + ticks * TICK_SECONDS - loop.time()
+            if delay < -5 * TICK_SECONDS:
+                # Too far behind to catch up; carry on from now
+                start, ticks = loop.time(), 0
+            await asyncio.sleep(max(0.0, delay))
+
+    def stop(self):
+        self.running = False
+
+
+class Client(asyncio.DatagramProtocol):
+    def __init__(self, room=0, loss=0.0, latency=0.0, jitter=0.0):
+        self.room = room
+        self.impairment = (loss, latency, jitter)
+        self.transport = None
+        self.side = None
+        self.welcomed = asyncio.Event()
+        self.mirror = Match(seed=0)
+        self.seq = 0
+        # Inputs the server hasn't applied yet: (seq, flags, time sent)
+        self.unacked = deque()
+        self.states = {}
+        self.tick = 0
+        self.latencies = []
+        self.mispredictions = 0
+        self.bytes_received = 0
+
+    def connection_made(self, transport):
+        self.transport = LossyTransport(transport, *self.impairment) if any(self.impairment) else transport
+
+    async def connect(self, attempts=20, interval=0.25):
+        """Say hello until the server answers."""
+        for _ in range(attempts):
+            self.transport.sendto(HELLO_MESSAGE.pack(HELLO, self.room))
+            try:
+                await asyncio.wait_for(self.welcomed.wait(), interval)
+                return self.side
+            except asyncio.TimeoutError:
+                pass
+        raise ConnectionError("no answer from the server")
+
+    def pause(self, paused=True):
+        """Hold the room's match (for both players) until pause(False)."""
+        self.transport.sendto(PAUSE_MESSAGE.pack(PAUSE, paused))
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.sendto(TYPE.pack(BYE))
+            self.transport.close()
+
+    def paddle(self):
+        return self.mirror.player_paddle if self.side == "player" else self.mirror.cpu_paddle
+
+    def predict(self, flags):
+        if self.mirror.phase == "playing":
+            self.paddle().move(bool(flags & UP), bool(flags & DOWN), self.mirror)
+
+    def send_input(self, up, down):
+        """Send this tick's keys and move the own paddle straight away."""
+        self.seq += 1
+        flags = (UP if up else 0) | (DOWN if down else 0)
+        self.unacked.append((self.seq, flags, time.perf_counter()))
+        window = bytes(flags for _, flags, _ in list(self.unacked)[-INPUT_WINDOW:])
+        self.transport.sendto(INPUT_MESSAGE.pack(INPUT, self.seq, self.tick, len(window)) + window)
+        self.predict(flags)
+
+    def datagram_received(self, data, address):
+        self.bytes_received += len(data) + UDP_OVERHEAD
+        if not whole_message(data, SERVER_MESSAGE_SIZES):
+            return
+        kind = data[0]
+        if kind == SNAPSHOT and self.side is not None:
+            self.receive_snapshot(data)
+        elif kind == WELCOME:
+            _, side, _, _, game_mode = WELCOME_MESSAGE.unpack_from(data)
+            if side >= len(SIDES) or game_mode >= len(GAME_MODES):
+                return
+            self.side = SIDES[side]
+            self.mirror.game_mode = GAME_MODES[game_mode]
+            self.welcomed.set()
+
+    def receive_snapshot(self, data):
+        _, tick, baseline_tick, processed, mask = SNAPSHOT_MESSAGE.unpack_from(data)
+        baseline = None
+        if baseline_tick:
+            baseline = self.states.get(baseline_tick)
+            if baseline is None:
+                return
+        try:
+            state = decode(data, SNAPSHOT_MESSAGE.size, mask, baseline)
+        except (struct.error, IndexError):
+            # Body cut short
+            return
+        self.states[tick] = state
+        if len(self.states) > BASELINE_HISTORY:
+            del self.states[min(self.states)]
+        if tick <= self.tick:
+            return
+        self.tick = tick
+
+        paddle = self.paddle()
+        predicted = paddle.rect.y
+        apply_state(self.mirror, state)
+        unacked = self.unacked
+        now = time.perf_counter()
+        while unacked and unacked[0][0] <= processed:
+            seq, _, sent = unacked.popleft()
+            if seq == processed:
+                self.latencies.append(now - sent)
+        # Put the paddle where the server has it and replay what it hasn't seen yet
+        for _, flags, _ in unacked:
+            self.predict(flags)
+        if paddle.rect.y != predicted:
+            self.mispredictions += 1
+
+
+class Bot:
+    """Stand-in player for load and loopback tests: chases the ball on the client's mirror."""
+
+    def __init__(self, client, dead_zone=10):
+        self.client = client
+        self.dead_zone = dead_zone
+
+    def keys(self):
+        offset = self.client.mirror.ball.rect.centery - self.client.paddle().rect.centery
+        return offset < -self.dead_zone, offset > self.dead_zone
+
+
+async def start_server(host="127.0.0.1", port=PORT, settings=None, **impairment):
+    loop = asyncio.get_running_loop()
+    transport, server = await loop.create_datagram_endpoint(lambda: Server(settings, **impairment),
+                                                            local_addr=(host, port))
+    return transport, server
+
+
+async def start_client(host="127.0.0.1", port=PORT, room=0, **impairment):
+    loop = asyncio.get_running_loop()
+    _, client = await loop.create_datagram_endpoint(lambda: Client(room, **impairment), remote_addr=(host, port))
+    await client.connect()
+    return client
+
+
+async def drive(clients, seconds):
+    """Send every client's bot keys once a tick for seconds."""
+    loop = asyncio.get_running_loop()
+    bots = [Bot(client) for client in clients]
+    start = loop.time()
+    ticks = 0
+    while loop.time() - start < seconds:
+        for client, bot in zip(clients, bots):
+            client.send_input(*bot.keys())
+        ticks += 1
+        await asyncio.sleep(max(0.0, start + ticks * TICK_SECONDS - loop.time()))
+
+
+async def loopback(seconds=10.0, port=PORT, loss=0.0, latency=0.0, jitter=0.0):
+    """A server and two bot clients on localhost, with impairment applied in both directions."""
+    transport, server = await start_server(port=port, loss=loss, latency=latency, jitter=jitter)
+    server_task = asyncio.create_task(server.run())
+    clients = [await start_client(port=port, loss=loss, latency=latency, jitter=jitter) for _ in SIDES]
+    await drive(clients, seconds)
+    server.stop()
+    await server_task
+    sent = {slot.side: slot.bytes_sent for slot in server.clients.values()}
+    for client in clients:
+        client.close()
+    transport.close()
+
+    rtt = 2 * latency + jitter
+    print(f"{seconds:.0f} s at {loss:.0%} loss, {latency * 1000:.0f} ms latency, {jitter * 1000:.0f} ms jitter "
+          f"each way (RTT up to {rtt * 1000:.0f} ms), server tick {server.ticks}")
+    for client in clients:
+        latencies = sorted(client.latencies)
+        slot_bytes = sent[client.side]
+        print(f"  {client.side:>6}: down {client.bytes_received / seconds / 1024:4.2f} KB/s "
+              f"(server sent {slot_bytes / seconds / 1024:4.2f}), "
+              f"input applied after p50 {statistics.median(latencies) * 1000:5.1f} ms / "
+              f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:5.1f} ms "
+              f"(RTT + 1 tick = {(rtt + TICK_SECONDS) * 1000:5.1f} ms), "
+              f"{client.mispredictions / seconds:4.1f} corrections/s")
+
+
+class LoadClient(asyncio.DatagramProtocol):
+    """A synthetic client for load tests: random keys, acknowledges snapshots, decodes nothing."""
+
+    def __init__(self, room, rng):
+        self.room = room
+        self.rng = rng
+        self.transport = None
+        self.seq = 0
+        self.tick = 0
+        self.flags = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+        transport.sendto(HELLO_MESSAGE.pack(HELLO, self.room))
+
+    def datagram_received(self, data, address):
+        if whole_message(data, SERVER_MESSAGE_SIZES) and data[0] == SNAPSHOT:
+            self.tick = max(self.tick, SNAPSHOT_MESSAGE.unpack_from(data)[1])
+
+    def send_input(self):
+        if not self.tick and self.seq % FPS == 0:
+            # Hellos can be lost when hundreds arrive at once
+            self.transport.sendto(HELLO_MESSAGE.pack(HELLO, self.room))
+        if self.rng.random() < 0.05:
+            self.flags = self.rng.choice((0, UP, DOWN))
+        self.seq += 1
+        self.transport.sendto(INPUT_MESSAGE.pack(INPUT, self.seq, self.tick, 1) + bytes((self.flags,)))
+
+
+async def drive_load(port, rooms, seconds):
+    loop = asyncio.get_running_loop()
+    rng = random.Random(0)
+    clients = []
+    for room in range(rooms):
+        for _ in SIDES:
+            _, client = await loop.create_datagram_endpoint(lambda: LoadClient(room, rng),
+                                                            remote_addr=("127.0.0.1", port))
+            clients.append(client)
+    start = loop.time()
+    ticks = 0
+    while loop.time() - start < seconds:
+        for client in clients:
+            client.send_input()
+        ticks += 1
+        await asyncio.sleep(max(0.0, start + ticks * TICK_SECONDS - loop.time()))
+    for client in clients:
+        client.transport.sendto(TYPE.pack(BYE))
+        client.transport.close()
+
+
+def run_load_clients(port, rooms, seconds):
+    asyncio.run(drive_load(port, rooms, seconds))
+
+
+async def loadtest(rooms=100, seconds=10.0, port=PORT, settings=None):
+    """
+    Host rooms rooms of two synthetic clients each, the clients running in
+    a separate process, and report what the server process spent per tick.
+    """
+    import multiprocessing
+
+    transport, server = await start_server(port=port, settings=settings)
+    server_task = asyncio.create_task(server.run())
+    load = multiprocessing.Process(target=run_load_clients, args=(port, rooms, seconds + 2))
+    load.start()
+    # Let every room fill up before measuring
+    await asyncio.sleep(2)
+    ticks, cpu, wall = server.ticks, time.process_time(), time.perf_counter()
+    await asyncio.sleep(seconds)
+    ticks, cpu, wall = server.ticks - ticks, time.process_time() - cpu, time.perf_counter() - wall
+    tick_ms = sorted(ns / 1e6 for ns in server.tick_ns)
+    hosted = len(server.rooms)
+    server.stop()
+    await server_task
+    load.join()
+    transport.close()
+
+    busy = cpu / wall
+    print(f"{hosted} rooms ({len(server.clients)} clients) for {wall:.1f} s: {ticks / wall:.1f} ticks/s, "
+          f"tick p50 {statistics.median(tick_ms):.2f} ms / p99 {tick_ms[int(len(tick_ms) * 0.99)]:.2f} ms, "
+          f"server process at {busy:.0%} of a core")
+    if hosted:
+        print(f"  {cpu / ticks / hosted * 1e6:.1f} us of CPU per room per tick, "
+              f"so about {hosted / busy:.0f} rooms per core")
+
+
+async def play_online(host, port, room=0):
+    """Join a server and play in a pygame window; the own paddle moves without waiting for the server."""
+    import pygame
+
+    from pong_chaos_edition import Game
+
+    client = await start_client(host, port, room)
+    game = Game()
+    pygame.display.set_caption(f"Pong: Chaos Edition - online ({'right' if client.side == 'player' else 'left'})")
+    game.match = client.mirror
+    game.resume()
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    ticks = 0
+    try:
+        while True:
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                return
+            keys = pygame.key.get_pressed()
+            client.send_input(keys[pygame.K_UP], keys[pygame.K_DOWN])
+            game.draw()
+            game.renderer.present()
+            ticks += 1
+            await asyncio.sleep(max(0.0, start + ticks * TICK_SECONDS - loop.time()))
+    finally:
+        client.close()
+        pygame.quit()
+
+
+async def serve_forever(host, port, **settings):
+    transport, server = await start_server(host, port, settings)
+    print(f"Serving on {host}:{port}")
+    try:
+        await server.run()
+    finally:
+        transport.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Networked Pong: Chaos Edition")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("server", help="host matches")
+    serve.add_argument("--host", default="0.0.0.0")
+    serve.add_argument("--port", type=int, default=PORT)
+    serve.add_argument("--classic", action="store_true", help="classic mode (no chaos objects)")
+    serve.add_argument("--mode", choices=GAME_MODES, default="single_play")
+    join = commands.add_parser("client", help="join a match")
+    join.add_argument("host")
+    join.add_argument("--port", type=int, default=PORT)
+    join.add_argument("--room", type=int, default=0, help="room to join (default: 0)")
+    test = commands.add_parser("loopback", help="server and two bots on localhost, with simulated loss and jitter")
+    test.add_argument("--seconds", type=float, default=10)
+    test.add_argument("--port", type=int, default=PORT)
+    test.add_argument("--loss", type=float, default=0.0, help="fraction of datagrams dropped each way")
+    test.add_argument("--latency", type=float, default=0.0, help="seconds added to every datagram")
+    test.add_argument("--jitter", type=float, default=0.0, help="up to this many more seconds, at random")
+    load = commands.add_parser("loadtest", help="server with many rooms of synthetic clients")
+    load.add_argument("--rooms", type=int, default=100)
+    load.add_argument("--seconds", type=float, default=10)
+    load.add_argument("--port", type=int, default=PORT)
+    load.add_argument("--classic", action="store_true", help="classic mode (no chaos objects)")
+    roundtrip = commands.add_parser("roundtrip", help="check snapshots survive encoding, dodgeball mode included")
+    roundtrip.add_argument("--ticks", type=int, default=FPS * 60)
+    roundtrip.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "server":
+        asyncio.run(serve_forever(args.host, args.port, classic_mode=args.classic, game_mode=args.mode))
+    elif args.command == "client":
+        asyncio.run(play_online(args.host, args.port, args.room))
+    elif args.command == "roundtrip":
+        failures = check_roundtrip(args.ticks, args.seed)
+        print(f"{args.ticks} ticks, {failures} failed to round-trip")
+        raise SystemExit(1 if failures else 0)
+    elif args.command == "loadtest":
+        asyncio.run(loadtest(args.rooms, args.seconds, args.port, {"classic_mode": args.classic}))
+    else:
+        asyncio.run(loopback(args.seconds, args.port, args.loss, args.latency, args.jitter))
@@ -0,0 +1,48 @@
+"""
+Free-list object pools for short-lived entities.
+
+Explosions, dodgeballs and chaos objects come and go all match long. A
+Pool hands out preallocated instances and takes them back when they're
+done, and compact() drops finished entities from an active list in place.
+Together they keep the frame loop from allocating, so the garbage
+collector has nothing to pause for.
+"""
+from operator import attrgetter
+
+
+class Pool:
+    def __init__(self, factory, size=0):
+        self.factory = factory
+        self.free = [factory() for _ in range(size)]
+
+    def acquire(self):
+        """A spare instance; the caller re-initializes it."""
+        free = self.free
+        return free.pop() if free else self.factory()
+
+    def release(self, item):
+        self.free.append(item)
+
+    def release_all(self, items):
+        """Return every item in the list to the pool and empty the list."""
+        self.free.extend(items)
+        items.clear()
+
+    def __len__(self):
+        return len(self.free)
+
+
+def compact(items, pool, keep=attrgetter("active")):
+    """
+    Remove the items for which keep(item) is false (by default, the ones no
+    longer .active) from the list in place, keeping the rest in order, and
+    hand the removed ones back to pool.
+    """
+    write = 0
+    for item in items:
+        if keep(item):
+            items[write] = item
+            write += 1
+        else:
+            pool.release(item)
+    del items[write:]
@@ -0,0 +1,179 @@
+"""
+Per-phase frame profiler for the pygame front end.
+
+Every frame, the time spent in each phase (event polling, ball movement and
+collisions, paddle AI, each chaos handler, drawing and presenting) is
+summed in nanoseconds and written into a preallocated ring buffer holding
+the last `capacity` frames. The engine isn't touched: instrument() swaps a
+match's methods for timed wrappers on that one instance. With profiling
+off, nothing is wrapped and the front end only pays a None check per frame.
+"""
+import csv
+import json
+from array import array
+from time import perf_counter_ns
+
+import pygame
+
+PHASES = ("events", "ball", "paddles", "spawn_chaos", "chaos_collision", "hot_potato", "dodgeball", "draw", "flip")
+
+PHASE_COLORS = {
+    "events": (120, 120, 120),
+    "ball": (255, 255, 255),
+    "paddles": (0, 200, 255),
+    "spawn_chaos": (0, 0, 255),
+    "chaos_collision": (120, 80, 255),
+    "hot_potato": (255, 0, 0),
+    "dodgeball": (255, 140, 0),
+    "draw": (0, 200, 0),
+    "flip": (255, 255, 0),
+}
+
+PERCENTILES = (50, 95, 99)
+
+
+class Profiler:
+    def __init__(self, capacity=600, phases=PHASES):
+        self.capacity = capacity
+        self.phases = phases
+        self.samples = {phase: array("q", bytes(8 * capacity)) for phase in phases}
+        self.current = dict.fromkeys(phases, 0)
+        self.frames = 0  # total frames recorded; the ring holds the last capacity
+        self.overlay = False
+        self._graph = None
+        self._graphed = 0
+        self._labels = None
+        self._labels_frame = 0
+
+    def add(self, phase, ns):
+        self.current[phase] += ns
+
+    def wrap(self, obj, name, phase):
+        """Time every call to obj.name under phase, on this instance only."""
+        method = getattr(obj, name)
+        current = self.current
+
+        def timed(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                current[phase] += perf_counter_ns() - start
+
+        setattr(obj, name, timed)
+
+    def instrument(self, match):
+        self.wrap(match.ball, "move", "ball")
+        self.wrap(match.ball, "sweep", "ball")
+        self.wrap(match.ball, "paddle_collision", "ball")
+        for paddle in (match.player_paddle, match.cpu_paddle):
+            self.wrap(paddle, "move", "paddles")
+            self.wrap(paddle, "auto_move", "paddles")
+        # A CPU controller sets the paddle's position itself, without Paddle.move
+        if match.cpu_controller is not None:
+            self.wrap(match.cpu_controller, "move", "paddles")
+        self.wrap(match, "spawn_chaos_object", "spawn_chaos")
+        self.wrap(match, "handle_chaos_collision", "chaos_collision")
+        self.wrap(match, "handle_hot_potato", "hot_potato")
+        self.wrap(match, "handle_dodgeball_mode", "dodgeball")
+
+    def end_frame(self):
+        slot = self.frames % self.capacity
+        current = self.current
+        for phase, samples in self.samples.items():
+            samples[slot] = current[phase]
+            current[phase] = 0
+        self.frames += 1
+
+    def recent(self, phase):
+        """The recorded samples for phase, oldest first."""
+        samples = self.samples[phase]
+        if self.frames <= self.capacity:
+            return list(samples[:self.frames])
+        slot = self.frames % self.capacity
+        return list(samples[slot:]) + list(samples[:slot])
+
+    def summary(self):
+        """{phase: {"p50": ms, "p95": ms, "p99": ms}} over the frames in the ring."""
+        result = {}
+        for phase in self.phases:
+            ordered = sorted(self.recent(phase))
+            result[phase] = {
+                f"p{q}": (ordered[(len(ordered) - 1) * q // 100] / 1e6 if ordered else 0.0)
+                for q in PERCENTILES
+            }
+        return result
+
+    def export_csv(self, path):
+        """One row per recorded frame, one column per phase, in nanoseconds."""
+        columns = [self.recent(phase) for phase in self.phases]
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("frame",) + self.phases)
+            first = self.frames - len(columns[0])
+            for i, row in enumerate(zip(*columns)):
+                writer.writerow((first + i,) + row)
+
+    def export_json(self, path):
+        with open(path, "w") as f:
+            json.dump({
+                "frames": self.frames,
+                "summary_ms": self.summary(),
+                "samples_ns": {phase: self.recent(phase) for phase in self.phases},
+            }, f)
+
+    def export(self, path):
+        if path.endswith(".csv"):
+            self.export_csv(path)
+        else:
+            self.export_json(path)
+
+    def _draw_column(self, graph, x, slot, scale):
+        height = graph.get_height()
+        graph.fill((0, 0, 0), (x, 0, 1, height))
+        y = height
+        for phase in self.phases:
+            bar = min(int(self.samples[phase][slot] * scale), y)
+            if bar:
+                y -= bar
+                graph.fill(PHASE_COLORS.get(phase, (255, 255, 255)), (x, y, 1, bar))
+
+    def draw_overlay(self, surface, font, text_cache, width=240, height=80, frame_budget_ms=1000 / 60):
+        """
+        Stacked bar graph of the last width frames, one pixel per frame,
+        with the frame budget marked, plus each phase's p95 below it. The
+        graph scrolls on a cached surface, so a frame only draws its own
+        column, and the percentiles are refreshed twice a second.
+        Returns the rects drawn.
+        """
+        scale = height / (2 * frame_budget_ms * 1e6)
+        if self._graph is None or self._graph.get_size() != (width, height):
+            self._graph = pygame.Surface((width, height))
+            self._graph.fill((0, 0, 0))
+            self._graphed = max(0, self.frames - min(width, self.capacity))
+        graph = self._graph
+        new = min(self.frames - self._graphed, width)
+        if new:
+            graph.scroll(-new, 0)
+            for i in range(new):
+                frame = self.frames - new + i
+                self._draw_column(graph, width - new + i, frame % self.capacity, scale)
+            budget_y = height - int(frame_budget_ms * 1e6 * scale)
+            pygame.draw.line(graph, (255, 0, 0), (0, budget_y), (width - 1, budget_y))
+            self._graphed = self.frames
+
+        if self._labels is None or self.frames - self._labels_frame >= 30:
+            self._labels = [
+                text_cache.render(font, f"{phase} p95 {stats['p95']:.2f} ms", True,
+                                  PHASE_COLORS.get(phase, (255, 255, 255)))
+                for phase, stats in self.summary().items()
+            ]
+            self._labels_frame = self.frames
+
+        left, top = 10, surface.get_height() - height - 20 * len(self.phases) - 10
+        rects = [surface.blit(graph, (left, top))]
+        y = top + height + 5
+        for label in self._labels:
+            rects.append(surface.blit(label, (left, y)))
+            y += 20
+        return rects
@@ -0,0 +1,132 @@
+"""
+Rendering helpers for the pygame front end.
+"""
+from collections import OrderedDict
+
+import pygame
+
+# Colors
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+
+
+class TextCache:
+    """
+    Bounded LRU cache of rendered text surfaces, keyed by
+    (font, text, antialias, color). Font rasterization is one of the most
+    expensive things a frame does, and the HUD and menus ask for the same
+    few strings over and over.
+    """
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def render(self, font, text, antialias, color):
+        key = (font, text, antialias, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+
+class DirtyRenderer:
+    """
+    Redraws only what moved. The static layer (black field and center line)
+    is rendered once into a background surface. Each frame erases the rects
+    drawn on the previous frame from it, the caller draws the current scene
+    through add()/blit(), and present() pushes just the old and new rects
+    with pygame.display.update. A full background blit and flip only happen
+    after invalidate(), e.g. when coming back from a menu.
+    """
+
+    def __init__(self, screen, background, enabled=True):
+        self.screen = screen
+        self.background = background
+        self.enabled = enabled
+        self.full_redraw = True
+        self._previous = []
+        self._current = []
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def begin(self):
+        if self.full_redraw or not self.enabled:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in self._previous:
+                self.screen.blit(self.background, rect, rect)
+        self._current = []
+
+    def add(self, rect):
+        """Record a rect the caller just drew (pygame.draw.* return one)."""
+        self._current.append(rect)
+        return rect
+
+    def blit(self, surface, position):
+        return self.add(self.screen.blit(surface, position))
+
+    def present(self):
+        if self.full_redraw or not self.enabled:
+            pygame.display.flip()
+            self.full_redraw = False
+        else:
+            pygame.display.update(self._previous + self._current)
+        self._previous = self._current
+
+
+class SpriteAtlas:
+    """
+    Everything round, pre-rendered once: the ball and dodgeball in white and
+    hot-potato red, and every frame of the explosion animation. Each is
+    drawn with the same pygame.draw calls the play field used to make every
+    frame, onto a black colorkeyed surface, so blitting one gives the same
+    pixels as drawing it. Needs the display to be set up (for convert()).
+    """
+
+    def __init__(self, ball_size=30, dodgeball_size=15, explosion_radii=range(10, 88, 8)):
+        self.ball = {color: self._ellipse(ball_size, color) for color in (WHITE, RED)}
+        self.dodgeball = {color: self._ellipse(dodgeball_size, color) for color in (WHITE, RED)}
+        self.explosion = {radius: self._explosion(radius) for radius in explosion_radii}
+
+    @staticmethod
+    def _sprite(width, height):
+        sprite = pygame.Surface((width, height)).convert()
+        sprite.fill(BLACK)
+        sprite.set_colorkey(BLACK, pygame.RLEACCEL)
+        return sprite
+
+    def _ellipse(self, size, color):
+        sprite = self._sprite(size, size)
+        pygame.draw.ellipse(sprite, color, (0, 0, size, size))
+        return sprite
+
+    def _explosion(self, radius):
+        # A radius r circle covers 2r pixels each way around its center
+        sprite = self._sprite(2 * radius, 2 * radius)
+        pygame.draw.circle(sprite, RED, (radius, radius), radius, 2)
+        pygame.draw.circle(sprite, WHITE, (radius, radius), radius // 2)
+        return sprite
+
+    def explosion_frame(self, radius):
+        """The pre-rendered frame for radius, or None if there isn't one."""
+        return self.explosion.get(radius)
@@ -0,0 +1,175 @@
+"""
+Deterministic input recording and replay.
+
+A Match is fully determined by its seed, its settings and the Inputs fed
+to each step(), so a Recording stores just those: the settings once, then
+one byte of flags per tick (keys held, plus markers for pausing and
+restarting). A full match is a few kilobytes before compression. replay()
+feeds a recording back through a fresh Match with nothing drawn, far
+faster than real time, and ends in the same state bit for bit.
+
+A CPU controller that searches on a time budget (the Expert) moves
+differently on a slower or busier machine, so its settings can't replay
+it. For those the recording also logs how far the CPU paddle moved on
+every call, and the replay plays the moves back instead of searching.
+"""
+import json
+import struct
+import sys
+import zlib
+from array import array
+
+import pong_engine
+from pong_ai import make_controller
+from pong_engine import Inputs, Match
+
+MAGIC = b"PONGREP1"
+HEADER = struct.Struct("<8sI")
+
+# Per-tick flags
+UP = 1
+DOWN = 2
+PAUSED = 4  # the game was paused just before this tick
+RESTART = 8  # the match was restarted (reset_game_state) just before this tick
+
+SETTINGS = ("classic_mode", "game_mode", "cpu_speed", "player_auto", "dodgeball_count", "dodgeball_collisions",
+            "max_chaos_objects", "swept_collisions")
+
+
+class MoveLog:
+    """Wraps a CPU controller and appends how far each of its moves takes the paddle to moves."""
+
+    def __init__(self, controller, moves):
+        self.controller = controller
+        self.moves = moves
+
+    def move(self, paddle, match):
+        y = paddle.rect.y
+        self.controller.move(paddle, match)
+        self.moves.append(paddle.rect.y - y)
+
+
+class LoggedMoves:
+    """Plays the moves a MoveLog logged back on the CPU paddle."""
+
+    def __init__(self, moves):
+        self.moves = moves
+        self.index = 0
+
+    def move(self, paddle, match):
+        paddle.rect.y += self.moves[self.index]
+        self.index += 1
+
+
+class Recording:
+    def __init__(self, seed, settings, paddle_speed=pong_engine.PADDLE_SPEED, ticks=None, cpu_moves=None):
+        self.seed = seed
+        self.settings = settings
+        self.paddle_speed = paddle_speed
+        self.ticks = array("B") if ticks is None else ticks
+        # CPU paddle moves, for controllers that search on a time budget
+        self.cpu_moves = cpu_moves
+        self._pending = 0
+
+    @classmethod
+    def from_match(cls, match):
+        """
+        Start recording a match that hasn't been stepped yet. A timed CPU
+        controller is wrapped in a MoveLog so its moves are recorded too.
+        """
+        settings = {name: getattr(match, name) for name in SETTINGS}
+        controller = match.cpu_controller
+        if controller is not None:
+            settings["cpu_controller"] = controller.spec()
+        recording = cls(match.seed, settings, match.paddle_speed)
+        if controller is not None and controller.timed:
+            recording.cpu_moves = array("h")
+            match.cpu_controller = MoveLog(controller, recording.cpu_moves)
+        return recording
+
+    def mark(self, flag):
+        """Attach PAUSED or RESTART to the next recorded tick."""
+        self._pending |= flag
+
+    def record(self, inputs):
+        self.ticks.append((UP if inputs.up else 0) | (DOWN if inputs.down else 0) | self._pending)
+        self._pending = 0
+
+    def new_match(self, **overrides):
+        """A fresh Match in the state this recording started from."""
+        if self.cpu_moves is not None:
+            controller = LoggedMoves(self.cpu_moves)
+        else:
+            controller = make_controller(self.settings.get("cpu_controller"))
+        settings = dict(self.settings, cpu_controller=controller)
+        match = Match(seed=self.seed, **dict(settings, **overrides))
+        match.paddle_speed = self.paddle_speed
+        return match
+
+    def __len__(self):
+        return len(self.ticks)
+
+    def save(self, path):
+        fields = {"seed": self.seed, "settings": self.settings, "paddle_speed": self.paddle_speed,
+                  "ticks": len(self.ticks)}
+        body = self.ticks.tobytes()
+        if self.cpu_moves is not None:
+            fields["cpu_moves"] = len(self.cpu_moves)
+            moves = array("h", self.cpu_moves)
+            if sys.byteorder == "big":
+                moves.byteswap()
+            body += moves.tobytes()
+        header = json.dumps(fields).encode()
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(header)))
+            f.write(header)
+            f.write(zlib.compress(body, 9))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            magic, header_size = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a Pong replay")
+            header = json.loads(f.read(header_size))
+            body = zlib.decompress(f.read())
+        ticks = array("B", body[:header["ticks"]])
+        cpu_moves = None
+        if "cpu_moves" in header:
+            # Stored little-endian
+            cpu_moves = array("h", body[header["ticks"]:])
+            if sys.byteorder == "big":
+                cpu_moves.byteswap()
+            if len(cpu_moves) != header["cpu_moves"]:
+                raise ValueError(f"{path} is truncated")
+        if len(ticks) != header["ticks"]:
+            raise ValueError(f"{path} is truncated")
+        return cls(header["seed"], header["settings"], header["paddle_speed"], ticks, cpu_moves)
+
+
+def apply(match, flags):
+    """Step match through one recorded tick."""
+    if flags & RESTART:
+        match.reset_game_state()
+    return match.step(Inputs(bool(flags & UP), bool(flags & DOWN)))
+
+
+def replay(recording, match=None):
+    """Run the whole recording headlessly and return the final match."""
+    if match is None:
+        match = recording.new_match()
+    for flags in recording.ticks:
+        apply(match, flags)
+    return match
+
+
+if __name__ == "__main__":
+    import time
+
+    recording = Recording.load(sys.argv[1])
+    start = time.perf_counter()
+    match = replay(recording)
+    elapsed = time.perf_counter() - start
+    print(f"{len(recording)} ticks ({len(recording) / pong_engine.FPS:.0f} s of play) replayed in {elapsed:.3f} s: "
+          f"{match.player_score}-{match.cpu_score}, games {match.player_games_won}-{match.cpu_games_won}, "
+          f"{'finished, ' + match.winner() + ' wins' if match.finished else 'unfinished'}")
@@ -0,0 +1,105 @@
+"""
+Startup-time check.
+
+Importing any of the game's modules must not initialize pygame: no
+display, no audio, no fonts, nothing printed. Simulation code (the engine,
+the tournament and its worker processes, the network server) never needs
+a pygame subsystem, and the front end starts only the display and font
+subsystems, when a Game is created (pong_chaos_edition.init_ui).
+
+This imports each module in a fresh interpreter under -X importtime,
+several times, and takes the module's own import cost from that same
+run: its cumulative time less pygame's (NumPy included). pygame costs
+most of the total and varies too much between interpreters to time
+separately and subtract. It exits non-zero if a module initializes
+anything, prints anything, or takes longer than BUDGET of pygame's
+import time in the same run.
+
+    python pong_startup.py
+"""
+import os
+import subprocess
+import sys
+
+MODULES = ("pong_engine", "pong_batch", "pong_tournament", "pong_net", "pong_chaos_edition")
+# Import time allowed on top of 'import pygame', as a share of what pygame
+# took in the same run, so a loaded machine slows both alike. pong_net is
+# the heaviest at about a third (some 60 ms, nearly all of it asyncio)
+BUDGET = 0.6
+RUNS = 7
+
+PROBE = """
+import {module}
+import pygame
+print(pygame.get_init(), pygame.display.get_init(), pygame.font.get_init())
+"""
+
+
+def import_times(report):
+    """{module: (cumulative seconds, nesting depth)} from -X importtime output."""
+    times = {}
+    for line in report.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = (int(cumulative) / 1e6, len(name) - len(name.lstrip()))
+    return times
+
+
+def pygame_cost(times):
+    """
+    What importing pygame cost in a run. pygame imports NumPy itself when
+    it is installed, so NumPy counts as pygame's even where a module
+    (pong_batch) imported it first.
+    """
+    cost, depth = times["pygame"]
+    if "numpy" in times:
+        numpy_cost, numpy_depth = times["numpy"]
+        # Deeper than pygame and listed before it means pygame imported it
+        nested = numpy_depth > depth and list(times).index("numpy") < list(times).index("pygame")
+        if not nested:
+            cost += numpy_cost
+    return cost
+
+
+def probe(module):
+    """
+    (own import seconds, pygame import seconds, pygame initialized, display
+    initialized, font initialized, stray output) in a fresh interpreter.
+    """
+    # Without PYGAME_HIDE_SUPPORT_PROMPT, so a module that lets pygame's banner through shows up
+    env = {name: value for name, value in os.environ.items() if name != "PYGAME_HIDE_SUPPORT_PROMPT"}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", PROBE.format(module=module)],
+                            capture_output=True, text=True, check=True, env=env,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    *stray, last = result.stdout.strip().splitlines()
+    times = import_times(result.stderr)
+    pygame_time = pygame_cost(times)
+    return times[module][0] - pygame_time, pygame_time, *(flag == "True" for flag in last.split()), stray
+
+
+def best_import(module):
+    """
+    Own and pygame import seconds from the least disturbed of RUNS runs
+    (the one where the module cost least next to pygame), and the last
+    run's flags.
+    """
+    samples = [probe(module) for _ in range(RUNS)]
+    best = min(samples, key=lambda sample: sample[0] / sample[1])
+    return best[0], best[1], samples[-1][2:]
+
+
+if __name__ == "__main__":
+    failed = False
+    for module in MODULES:
+        elapsed, pygame_time, (pygame_init, display_init, font_init, stray) = best_import(module)
+        problems = [name for name, bad in (("pygame.init", pygame_init), ("display", display_init),
+                                           ("font", font_init), ("printed output", stray)) if bad]
+        if elapsed > BUDGET * pygame_time:
+            problems.append(f"over the budget of {BUDGET:.0%} of pygame's import")
+        failed = failed or bool(problems)
+        print(f"{'import ' + module:<26} {elapsed * 1000:6.1f} ms "
+              f"({elapsed / pygame_time:4.0%} of pygame's {pygame_time * 1000:5.1f} ms)"
+              f"{'  FAIL: ' + ', '.join(problems) if problems else ''}")
+    sys.exit(1 if failed else 0)
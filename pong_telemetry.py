@@ -0,0 +1,189 @@
+"""
+Columnar match telemetry.
+
+A Telemetry recorder keeps two tables of NumPy columns. Per tick
+(sample()) it stores ball position and velocity, paddle positions, phase,
+gimmick_active, hot_potato_hits and last_touched_by. Per event (it is an
+event sink, Match(event_log=...)) it stores paddle hits, gimmick
+activations (including speed changes starting), the end of speed changes,
+dodgeball hits, goals, explosions and serves. Rows go into preallocated
+arrays that double when full, so recording costs a few array stores per
+tick.
+
+save() writes each column to its own .npy file, and load() maps them back
+read-only with no copying, so millions of rallies from many runs can be
+queried with plain NumPy:
+
+    python pong_tournament.py --matches 200 --telemetry runs/
+    python pong_telemetry.py runs/
+"""
+import json
+import os
+
+import numpy as np
+
+from pong_events import DEBUG
+from pong_snapshot import GIMMICKS, PHASES, TOUCHERS
+
+TICK_COLUMNS = {
+    "match": np.int32, "tick": np.int32,
+    "ball_x": np.float32, "ball_y": np.float32, "speed_x": np.float32, "speed_y": np.float32,
+    "player_y": np.int16, "cpu_y": np.int16,
+    "phase": np.int8, "gimmick": np.int8, "hot_potato_hits": np.int8, "last_touched_by": np.int8,
+}
+EVENT_COLUMNS = {
+    "match": np.int32, "tick": np.int32, "kind": np.int8, "side": np.int8, "gimmick": np.int8,
+    "x": np.float32, "y": np.float32,
+}
+# Event kinds recorded; "gimmick" with a speed change gimmick is a speed change starting
+EVENT_KINDS = ("serve", "paddle_hit", "gimmick", "speed_change_end", "dodgeball_hit", "goal", "explosion")
+KIND_CODES = {kind: code for code, kind in enumerate(EVENT_KINDS)}
+# side is an index into TOUCHERS: 0 for none, 1 player, 2 cpu
+SIDE_FIELDS = ("paddle", "scorer", "last_touched_by")
+
+
+class Columns:
+    """Named NumPy columns of equal length that grow by doubling as rows are appended."""
+
+    def __init__(self, dtypes, capacity=1 << 16):
+        self.names = tuple(dtypes)
+        self.arrays = [np.empty(capacity, dtype) for dtype in dtypes.values()]
+        self.size = 0
+
+    def reserve(self):
+        """Index of a new row, growing the arrays if they are full."""
+        if self.size == len(self.arrays[0]):
+            self.arrays = [np.resize(array, 2 * len(array)) for array in self.arrays]
+        self.size += 1
+        return self.size - 1
+
+    def append(self, *values):
+        row = self.reserve()
+        for array, value in zip(self.arrays, values):
+            array[row] = value
+
+    def __getitem__(self, name):
+        return self.arrays[self.names.index(name)][:self.size]
+
+    def __len__(self):
+        return self.size
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name, array in zip(self.names, self.arrays):
+            np.save(os.path.join(directory, name + ".npy"), array[:self.size])
+
+
+class Telemetry:
+    level = DEBUG
+
+    def __init__(self, capacity=1 << 16):
+        self.ticks = Columns(TICK_COLUMNS, capacity)
+        self.events = Columns(EVENT_COLUMNS, capacity // 16)
+        self.match_index = -1
+
+    def start_match(self):
+        """Number the rows that follow as a new match."""
+        self.match_index += 1
+
+    def sample(self, match):
+        """Record match's state at its current tick."""
+        ball = match.ball
+        ticks = self.ticks
+        row = ticks.reserve()
+        (matches, tick, ball_x, ball_y, speed_x, speed_y, player_y, cpu_y,
+         phase, gimmick, hot_potato_hits, last_touched_by) = ticks.arrays
+        matches[row] = self.match_index
+        tick[row] = match.tick
+        ball_x[row] = ball.x
+        ball_y[row] = ball.y
+        speed_x[row] = ball.speed_x
+        speed_y[row] = ball.speed_y
+        player_y[row] = match.player_paddle.rect.y
+        cpu_y[row] = match.cpu_paddle.rect.y
+        phase[row] = PHASES.index(match.phase)
+        gimmick[row] = GIMMICKS.index(match.gimmick_active)
+        hot_potato_hits[row] = ball.hot_potato_hits
+        last_touched_by[row] = TOUCHERS.index(ball.last_touched_by)
+
+    def emit(self, tick, level, event, fields):
+        kind = KIND_CODES.get(event)
+        if kind is None:
+            return
+        side = 0
+        for name in SIDE_FIELDS:
+            if name in fields:
+                side = TOUCHERS.index(fields[name])
+                break
+        self.events.append(self.match_index, tick, kind, side, GIMMICKS.index(fields.get("gimmick")),
+                           fields.get("x", np.nan), fields.get("y", np.nan))
+
+    def save(self, directory, meta=None):
+        """Write every column to directory/ticks/*.npy and directory/events/*.npy, plus meta as meta.json."""
+        self.ticks.save(os.path.join(directory, "ticks"))
+        self.events.save(os.path.join(directory, "events"))
+        with open(os.path.join(directory, "meta.json"), "w") as f:
+            json.dump(dict(meta or {}, matches=self.match_index + 1), f)
+
+
+def load(directory):
+    """(ticks, events, meta) of a saved run; the columns are read-only memory maps."""
+    tables = []
+    for table, columns in (("ticks", TICK_COLUMNS), ("events", EVENT_COLUMNS)):
+        tables.append({name: np.load(os.path.join(directory, table, name + ".npy"), mmap_mode="r")
+                       for name in columns})
+    with open(os.path.join(directory, "meta.json")) as f:
+        meta = json.load(f)
+    return tables[0], tables[1], meta
+
+
+def find_runs(root):
+    """Every saved run directory under root (root itself included)."""
+    return sorted(path for path, _, files in os.walk(root) if "meta.json" in files)
+
+
+def summarize(runs):
+    """Rally-level figures over the saved runs: see the __main__ block."""
+    totals = dict.fromkeys(("matches", "ticks", "points", "paddle_hits", "hot_potatoes", "explosions",
+                            "speed_change_ticks", "speed_change_goals", "normal_ticks", "normal_goals"), 0)
+    speed_changes = [GIMMICKS.index(name) for name in ("speed_change_increase", "speed_change_decrease")]
+    playing = PHASES.index("playing")
+    kind = KIND_CODES
+    hot_potato = GIMMICKS.index("hot_potato")
+    for directory in runs:
+        ticks, events, meta = load(directory)
+        kinds, gimmicks = events["kind"], events["gimmick"]
+        in_play = ticks["phase"] == playing
+        speeding = np.isin(ticks["gimmick"], speed_changes)
+        goals = kinds == kind["goal"]
+        goal_gimmicks = gimmicks[goals]
+        totals["matches"] += meta["matches"]
+        totals["ticks"] += len(ticks["tick"])
+        totals["points"] += int(np.count_nonzero(goals))
+        totals["paddle_hits"] += int(np.count_nonzero(kinds == kind["paddle_hit"]))
+        totals["hot_potatoes"] += int(np.count_nonzero((kinds == kind["gimmick"]) & (gimmicks == hot_potato)))
+        totals["explosions"] += int(np.count_nonzero(kinds == kind["explosion"]))
+        totals["speed_change_ticks"] += int(np.count_nonzero(in_play & speeding))
+        totals["normal_ticks"] += int(np.count_nonzero(in_play & (ticks["gimmick"] == GIMMICKS.index(None))))
+        totals["speed_change_goals"] += int(np.count_nonzero(np.isin(goal_gimmicks, speed_changes)))
+        totals["normal_goals"] += int(np.count_nonzero(goal_gimmicks == GIMMICKS.index(None)))
+    return totals
+
+
+if __name__ == "__main__":
+    import sys
+
+    from pong_engine import FPS
+
+    runs = [run for root in sys.argv[1:] for run in find_runs(root)]
+    if not runs:
+        sys.exit("usage: python pong_telemetry.py DIR... (runs saved by Telemetry.save)")
+    totals = summarize(runs)
+    minutes = FPS * 60
+    print(f"{len(runs)} runs, {totals['matches']} matches, {totals['ticks']} ticks, {totals['points']} points")
+    print(f"paddle hits per point: {totals['paddle_hits'] / max(totals['points'], 1):.2f}")
+    print(f"hot potatoes reaching 6 hits: {totals['explosions']} of {totals['hot_potatoes']} "
+          f"({totals['explosions'] / max(totals['hot_potatoes'], 1):.1%})")
+    print(f"goals per minute in play: {totals['normal_goals'] / max(totals['normal_ticks'], 1) * minutes:.2f} "
+          f"normally, {totals['speed_change_goals'] / max(totals['speed_change_ticks'], 1) * minutes:.2f} "
+          f"during speed changes")
@@ -0,0 +1,66 @@
+"""
+Tick-based scheduler for gimmick durations and delayed game events.
+
+Timers are kept in a binary heap ordered by (due tick, arm order), so
+arming is O(log n), cancelling is O(1) (the entry is just marked dead and
+skipped when it reaches the top) and a tick with nothing due costs a
+single comparison. Timers armed for the same tick fire in the order they
+were armed, which keeps a match deterministic.
+"""
+import heapq
+import itertools
+
+
+class Timer:
+    __slots__ = ("due", "seq", "callback")
+
+    def __init__(self, due, seq, callback):
+        self.due = due
+        self.seq = seq
+        self.callback = callback
+
+    def __lt__(self, other):
+        return (self.due, self.seq) < (other.due, other.seq)
+
+    @property
+    def active(self):
+        return self.callback is not None
+
+
+class Scheduler:
+    def __init__(self):
+        self.tick = 0
+        self._heap = []
+        self._seq = itertools.count()
+
+    def call_at(self, tick, callback):
+        """Run callback() once the scheduler reaches the given tick."""
+        timer = Timer(tick, next(self._seq), callback)
+        heapq.heappush(self._heap, timer)
+        return timer
+
+    def call_later(self, ticks, callback):
+        return self.call_at(self.tick + ticks, callback)
+
+    def cancel(self, timer):
+        if timer is not None:
+            timer.callback = None
+
+    def advance(self, tick):
+        """Move time forward to tick and fire every timer that is due."""
+        self.tick = tick
+        heap = self._heap
+        while heap and heap[0].due <= tick:
+            timer = heapq.heappop(heap)
+            callback = timer.callback
+            if callback is not None:
+                timer.callback = None
+                callback()
+
+    def clear(self):
+        for timer in self._heap:
+            timer.callback = None
+        self._heap.clear()
+
+    def __len__(self):
+        return sum(1 for timer in self._heap if timer.callback is not None)
@@ -0,0 +1,249 @@
+"""
+Tournament runner for balance testing.
+
+Plays headless matches for every combination of classic/chaos mode, game
+mode and difficulty across a process pool, and prints aggregated win
+rates, rally lengths, gimmick frequencies and match durations as chunks of
+matches come back. Each match's seed is derived from the base seed and the
+match's place in the sweep, so results don't depend on the worker count or
+on which worker ran what. The CPU is the original chaser the game uses
+for easy to hard unless --cpu picks one of pong_ai's controllers.
+
+    python pong_tournament.py --matches 500 --player scripted
+
+With --telemetry DIR each chunk also saves per-tick and per-event columns
+(pong_telemetry) under DIR for analysis with pong_telemetry.py.
+"""
+import itertools
+import os
+import statistics
+
+from pong_ai import InterceptController, LookaheadController
+from pong_engine import DIFFICULTY_SPEEDS, FPS, NO_INPUT, WIDTH, Inputs, Match
+from pong_events import DEBUG, EventFanout
+
+GAME_MODES = ("single_play", "bo3", "bo5")
+GIMMICK_NAMES = ("hot_potato", "dodgeball", "speed_change_increase", "speed_change_decrease")
+
+
+class MatchStats:
+    """Event sink for Match(event_log=...) that keeps counts instead of writing anything."""
+
+    level = DEBUG
+
+    def __init__(self):
+        self.rallies = []
+        self.rally = 0
+        self.gimmicks = dict.fromkeys(GIMMICK_NAMES, 0)
+        self.explosions = 0
+
+    def emit(self, tick, level, event, fields):
+        if event == "paddle_hit":
+            self.rally += 1
+        elif event == "goal" or event == "explosion":
+            self.rallies.append(self.rally)
+            self.rally = 0
+            self.explosions += event == "explosion"
+        elif event == "gimmick":
+            self.gimmicks[fields["gimmick"]] += 1
+
+    def cut_off(self):
+        """The match was stopped mid-rally; count the rally so far."""
+        self.rallies.append(self.rally)
+        self.rally = 0
+
+
+class ScriptedPlayer:
+    """
+    A human-like stand-in for the player: it only chases the ball while
+    the ball is coming towards it on its half, and only looks up where the
+    ball is every reaction_ticks ticks, so late bounces can beat it.
+    """
+
+    def __init__(self, reaction_ticks=20, dead_zone=10):
+        self.reaction_ticks = reaction_ticks
+        self.dead_zone = dead_zone
+        self.target = None
+
+    def inputs(self, match):
+        ball, paddle = match.ball, match.player_paddle
+        if ball.speed_x <= 0 or ball.rect.centerx < WIDTH // 2:
+            self.target = None
+            return NO_INPUT
+        if self.target is None or match.tick % self.reaction_ticks == 0:
+            self.target = ball.rect.centery
+        offset = self.target - paddle.rect.centery
+        return Inputs(offset < -self.dead_zone, offset > self.dead_zone)
+
+
+def match_seed(base_seed, combo_index, match_index):
+    return base_seed * 10 ** 9 + combo_index * 10 ** 6 + match_index
+
+
+def run_chunk(combo_index, classic_mode, game_mode, difficulty, player, first, count, base_seed, max_ticks,
+              reaction_ticks=20, cpu="chase", telemetry_dir=None):
+    """Play count matches of one combination and return their aggregate."""
+    telemetry = None
+    if telemetry_dir is not None:
+        from pong_telemetry import Telemetry
+        telemetry = Telemetry()
+    result = {
+        "matches": 0, "player_wins": 0, "cpu_wins": 0, "unfinished": 0,
+        "durations": [], "rally_total": 0, "rally_count": 0, "rally_max": 0,
+        "gimmicks": dict.fromkeys(GIMMICK_NAMES, 0), "explosions": 0,
+    }
+    for match_index in range(first, first + count):
+        stats = MatchStats()
+        scripted = ScriptedPlayer(reaction_ticks)
+        controller = None
+        if cpu == "intercept":
+            controller = InterceptController.for_difficulty(difficulty)
+        elif cpu == "lookahead":
+            # A fixed number of rollouts rather than a time budget, so results are reproducible
+            controller = LookaheadController(budget_us=None, rollouts=4)
+        event_log = stats
+        if telemetry is not None:
+            telemetry.start_match()
+            event_log = EventFanout(stats, telemetry)
+        match = Match(classic_mode=classic_mode, game_mode=game_mode, cpu_speed=DIFFICULTY_SPEEDS[difficulty],
+                      player_auto=player == "cpu", event_log=event_log,
+                      seed=match_seed(base_seed, combo_index, match_index), cpu_controller=controller)
+        while not match.finished and match.tick < max_ticks:
+            match.step(NO_INPUT if player == "cpu" else scripted.inputs(match))
+            if telemetry is not None:
+                telemetry.sample(match)
+
+        result["matches"] += 1
+        if not match.finished:
+            stats.cut_off()
+            result["unfinished"] += 1
+        elif match.winner() == "Player":
+            result["player_wins"] += 1
+        else:
+            result["cpu_wins"] += 1
+        result["durations"].append(match.tick / FPS)
+        result["rally_total"] += sum(stats.rallies)
+        result["rally_count"] += len(stats.rallies)
+        result["rally_max"] = max(result["rally_max"], max(stats.rallies, default=0))
+        for name, hits in stats.gimmicks.items():
+            result["gimmicks"][name] += hits
+        result["explosions"] += stats.explosions
+    if telemetry is not None:
+        telemetry.save(os.path.join(telemetry_dir, f"{combo_index:02d}-{first:06d}"), {
+            "classic_mode": classic_mode, "game_mode": game_mode, "difficulty": difficulty, "player": player,
+            "cpu": cpu, "first_match": first, "base_seed": base_seed,
+        })
+    return combo_index, result
+
+
+def merge(total, part):
+    for key, value in part.items():
+        if key == "durations":
+            total[key].extend(value)
+        elif key == "rally_max":
+            total[key] = max(total[key], value)
+        elif key == "gimmicks":
+            for name, hits in value.items():
+                total[key][name] += hits
+        else:
+            total[key] += value
+
+
+def summarize(combo, result):
+    classic_mode, game_mode, difficulty = combo
+    played = result["matches"]
+    durations = result["durations"]
+    return {
+        "classic_mode": classic_mode,
+        "game_mode": game_mode,
+        "difficulty": difficulty,
+        "matches": played,
+        "cpu_win_rate": result["cpu_wins"] / played,
+        "player_win_rate": result["player_wins"] / played,
+        "unfinished_rate": result["unfinished"] / played,
+        "mean_rally": result["rally_total"] / result["rally_count"] if result["rally_count"] else 0.0,
+        "max_rally": result["rally_max"],
+        "gimmicks_per_match": {name: hits / played for name, hits in result["gimmicks"].items()},
+        "explosions_per_match": result["explosions"] / played,
+        "mean_duration_s": statistics.fmean(durations),
+        "median_duration_s": statistics.median(durations),
+    }
+
+
+def format_row(row):
+    mode = "classic" if row["classic_mode"] else "chaos"
+    gimmicks = sum(row["gimmicks_per_match"].values())
+    return (f"{mode:>7} {row['game_mode']:>11} {row['difficulty']:>6}  {row['matches']:>6}  "
+            f"CPU {row['cpu_win_rate']:6.1%}  unfinished {row['unfinished_rate']:5.1%}  "
+            f"rally {row['mean_rally']:5.1f} (max {row['max_rally']:>3})  "
+            f"gimmicks/match {gimmicks:5.2f}  duration {row['mean_duration_s']:6.1f} s")
+
+
+def run_tournament(matches, player="cpu", workers=None, chunk_size=25, seed=0, max_ticks=FPS * 60 * 10,
+                   reaction_ticks=20, cpu="chase", telemetry_dir=None, progress=print):
+    """
+    Play matches matches per combination and return one summary row per
+    combination. progress(text) is called as chunks finish. With
+    telemetry_dir, every chunk saves its telemetry in a directory under it.
+    """
+    # Imported here so worker processes, which only need run_chunk, start faster
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    combos = list(itertools.product((False, True), GAME_MODES, DIFFICULTY_SPEEDS))
+    totals = {}
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(run_chunk, index, classic_mode, game_mode, difficulty, player,
+                        first, min(chunk_size, matches - first), seed, max_ticks, reaction_ticks, cpu,
+                        telemetry_dir)
+            for index, (classic_mode, game_mode, difficulty) in enumerate(combos)
+            for first in range(0, matches, chunk_size)
+        ]
+        for future in as_completed(futures):
+            index, part = future.result()
+            if index in totals:
+                merge(totals[index], part)
+            else:
+                totals[index] = part
+            done += 1
+            if progress is not None:
+                progress(f"[{done}/{len(futures)}] {format_row(summarize(combos[index], totals[index]))}")
+    return [summarize(combos[index], totals[index]) for index in sorted(totals)]
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import time
+
+    parser = argparse.ArgumentParser(description="Headless balance-testing tournament")
+    parser.add_argument("--matches", type=int, default=100, help="matches per combination (default: 100)")
+    parser.add_argument("--player", choices=("cpu", "scripted"), default="cpu",
+                        help="who plays the right paddle: the CPU logic or a scripted human stand-in")
+    parser.add_argument("--reaction", type=int, default=20,
+                        help="ticks between the scripted player's looks at the ball (default: 20)")
+    parser.add_argument("--cpu", choices=("chase", "intercept", "lookahead"), default="chase",
+                        help="the left paddle's logic: the original ball chaser (default, as the game's easy to "
+                             "hard CPU) or one of pong_ai's controllers")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--chunk", type=int, default=25, help="matches per job (default: 25)")
+    parser.add_argument("--seed", type=int, default=0, help="base seed (default: 0)")
+    parser.add_argument("--max-minutes", type=float, default=10,
+                        help="give up on a match after this much game time (default: 10)")
+    parser.add_argument("--json", metavar="PATH", help="also write the final summary to PATH")
+    parser.add_argument("--telemetry", metavar="DIR", help="record per-tick and per-event columns under DIR")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = run_tournament(args.matches, args.player, args.workers, args.chunk, args.seed,
+                          int(args.max_minutes * 60 * FPS), args.reaction, args.cpu,
+                          args.telemetry)
+    elapsed = time.perf_counter() - start
+    print()
+    for row in rows:
+        print(format_row(row))
+    print(f"{args.matches * len(rows)} matches on {args.workers} workers in {elapsed:.1f} s")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)